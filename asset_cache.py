@@ -0,0 +1,79 @@
+import os, glob, time, hashlib, mmap, struct
+
+# --- Shared decoded-asset cache ---
+# Decoded, scaled RGBA frames are written once per asset hash and size, then
+# memory-mapped copy-on-write: pages stay shared by every game instance on the
+# host until written, and the frames are writable buffers, which Kivy's
+# Texture.blit_buffer requires for anything that isn't bytes. Nothing here
+# imports Kivy.
+def default_asset_cache_dir():
+    """Per-user, disk-backed cache directory (not the shared, often RAM-backed temp dir)."""
+    base = (os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "chicken-shooter", "assets")
+
+asset_cache_dir = os.environ.get("CHICKEN_ASSET_CACHE") or default_asset_cache_dir()
+# Files for other sizes of the same asset are deleted once unused for this long
+asset_cache_max_age = 7 * 24 * 3600
+asset_cache_magic = b"CSAC"
+asset_cache_version = 1
+asset_cache_header = struct.Struct("<4sIIII")  # magic, version, width, height, frame count
+
+def map_cache_file(cache_path, size):
+    with open(cache_path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, version, width, height, count = asset_cache_header.unpack_from(mapped)
+    frame_bytes = width * height * 4
+    if (magic != asset_cache_magic or version != asset_cache_version or (width, height) != size
+            or len(mapped) != asset_cache_header.size + count * frame_bytes):
+        mapped.close()
+        raise ValueError(f"Stale asset cache file: {cache_path}")
+    view = memoryview(mapped)
+    start = asset_cache_header.size
+    return [view[start + i * frame_bytes:start + (i + 1) * frame_bytes] for i in range(count)]
+
+def prune_cache_files(digest, keep_path):
+    """Delete cached sizes of this asset that no instance has mapped recently."""
+    cutoff = time.time() - asset_cache_max_age
+    for cache_path in glob.glob(os.path.join(asset_cache_dir, f"{digest}_*.rgba")):
+        try:
+            if cache_path != keep_path and os.path.getmtime(cache_path) < cutoff:
+                os.remove(cache_path)
+        except OSError:
+            pass  # Still mapped elsewhere (Windows) or already gone
+
+def write_cache_file(cache_path, size, frames):
+    os.makedirs(asset_cache_dir, mode=0o700, exist_ok=True)
+    # Write to a private file first so other instances never map a partial one
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(asset_cache_header.pack(asset_cache_magic, asset_cache_version, size[0], size[1], len(frames)))
+        for frame in frames:
+            f.write(frame)
+    os.replace(tmp_path, cache_path)
+
+def load_cached_frames(path, size, decode):
+    """Return the RGBA frames of `path` at `size`, calling decode() only on a cache miss."""
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    cache_path = os.path.join(asset_cache_dir, f"{digest}_{size[0]}x{size[1]}.rgba")
+    try:
+        frames = map_cache_file(cache_path, size)
+    except (OSError, ValueError, struct.error):
+        frames = None
+    if frames is not None:
+        # Mapping counts as use, so sizes still in use on this host are never pruned
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass  # Read-only shared cache; nothing here prunes it either
+        return frames
+
+    frames = decode()
+    try:
+        write_cache_file(cache_path, size, frames)
+        prune_cache_files(digest, cache_path)
+        return map_cache_file(cache_path, size)
+    except (OSError, ValueError, struct.error):
+        # Cache not writable: fall back to this process's own copy
+        return frames
@@ -0,0 +1,171 @@
+import socket, struct
+
+# --- Spectator broadcast ---
+# The game can stream its state over UDP to viewer instances (queue displays).
+# Every packet is either a keyframe with all chickens, or a delta against the
+# last keyframe: chickens still near their keyframe position are sent as small
+# quantized offsets, the rest as absolute records, plus the ids that left.
+# A delta never depends on the delta before it, so a lost packet never
+# corrupts what the viewer shows. Nothing here imports Kivy.
+broadcast_magic = b"CSB2"
+broadcast_keyframe, broadcast_delta = 0, 1
+# magic, kind, tick, keyframe tick, sender width, sender height, score, misses,
+# game state, absolute records, offset records, removed ids
+broadcast_header = struct.Struct("<4sBIIHHIIBHHH")
+broadcast_chicken = struct.Struct("<HhhB")  # id, x, y, fried
+broadcast_offset = struct.Struct("<HbbB")  # id, dx, dy from the keyframe in offset steps, fried
+broadcast_removed = struct.Struct("<H")
+broadcast_states = ["loading", "home", "about", "settings", "playing", "paused", "gameover"]
+keyframe_interval = 15  # ticks between full snapshots
+offset_step = 4  # pixels per offset unit, offsets reach +-508 px off the keyframe
+
+def parse_address(spec, default_host="127.0.0.1"):
+    host, port = spec.rsplit(":", 1)
+    return host or default_host, int(port)
+
+def quantize_offset(position, keyframe_position):
+    """Return (dx, dy) in offset steps, or None if either does not fit an int8."""
+    dx = round((position[0] - keyframe_position[0]) / offset_step)
+    dy = round((position[1] - keyframe_position[1]) / offset_step)
+    if -128 <= dx <= 127 and -128 <= dy <= 127:
+        return dx, dy
+    return None
+
+class StatePublisher:
+    """Sends the game state once per tick as keyframes and keyframe deltas."""
+    def __init__(self, address, sender_size):
+        self.address = address
+        self.sender_size = sender_size
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        self.sock.setblocking(False)
+        self.tick = 0
+        self.keyframe = {}
+        self.keyframe_tick = None
+        self.net_ids = {}  # id(chicken) -> (chicken, network id)
+        self.next_net_id = 0
+
+    def chicken_records(self, chickens):
+        net_ids = {}
+        records = {}
+        for chicken in chickens:
+            if chicken["state"] == "done":
+                continue
+            entry = self.net_ids.get(id(chicken))
+            if entry is None:
+                entry = (chicken, self.next_net_id)
+                self.next_net_id = (self.next_net_id + 1) % 65536
+            net_ids[id(chicken)] = entry
+            records[entry[1]] = (int(chicken["x"]), int(chicken["current_y"]), chicken["state"] == "hit")
+        # Holding the chickens keeps their id() from being reused while tracked
+        self.net_ids = net_ids
+        return records
+
+    def encode(self, chickens, score, misses, game_state):
+        records = self.chicken_records(chickens)
+        absolute, offsets, removed = records, {}, []
+        kind = broadcast_keyframe
+        if self.keyframe_tick is not None and self.tick - self.keyframe_tick < keyframe_interval:
+            absolute = {}
+            for net_id, (x, y, fried) in records.items():
+                base = self.keyframe.get(net_id)
+                offset = quantize_offset((x, y), base) if base else None
+                if offset is None:
+                    absolute[net_id] = (x, y, fried)
+                elif offset != (0, 0) or fried != base[2]:
+                    offsets[net_id] = offset + (fried,)
+            removed = [net_id for net_id in self.keyframe if net_id not in records]
+            delta_size = (len(absolute) * broadcast_chicken.size + len(offsets) * broadcast_offset.size
+                          + len(removed) * broadcast_removed.size)
+            # Once most chickens have drifted out of offset range a keyframe is cheaper
+            if delta_size < len(records) * broadcast_chicken.size:
+                kind = broadcast_delta
+        if kind == broadcast_keyframe:
+            absolute, offsets, removed = records, {}, []
+            self.keyframe = records
+            self.keyframe_tick = self.tick
+
+        parts = [broadcast_header.pack(broadcast_magic, kind, self.tick, self.keyframe_tick,
+                                       self.sender_size[0], self.sender_size[1], score, misses,
+                                       broadcast_states.index(game_state), len(absolute), len(offsets), len(removed))]
+        parts += [broadcast_chicken.pack(net_id, x, y, fried) for net_id, (x, y, fried) in absolute.items()]
+        parts += [broadcast_offset.pack(net_id, dx, dy, fried) for net_id, (dx, dy, fried) in offsets.items()]
+        parts += [broadcast_removed.pack(net_id) for net_id in removed]
+        self.tick += 1
+        return b"".join(parts)
+
+    def publish(self, chickens, score, misses, game_state):
+        try:
+            self.sock.sendto(self.encode(chickens, score, misses, game_state), self.address)
+        except OSError:
+            pass  # Spectators are optional; never let them stall the game
+
+class StateReceiver:
+    """Rebuilds the broadcast game state from keyframes and deltas."""
+    def __init__(self, address, sender_size):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(address)
+        self.sock.setblocking(False)
+        self.tick = None
+        self.keyframe = None
+        self.keyframe_tick = None
+        self.chickens = {}  # network id -> (x, y, fried) in sender coordinates
+        self.sender_size = sender_size
+        self.score = 0
+        self.misses = 0
+        self.game_state = None
+
+    def poll(self):
+        """Apply every packet waiting on the socket; returns True if anything arrived."""
+        received = False
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                return received
+            try:
+                received = self.apply(data) or received
+            except (ValueError, IndexError, KeyError, struct.error):
+                pass  # Ignore malformed packets
+
+    def apply(self, data):
+        """Apply one packet; it is checked in full before any state changes."""
+        (magic, kind, tick, keyframe_tick, width, height, score, misses, state,
+         absolute_count, offset_count, removed_count) = broadcast_header.unpack_from(data)
+        if (magic != broadcast_magic or kind not in (broadcast_keyframe, broadcast_delta)
+                or width == 0 or height == 0 or state >= len(broadcast_states)):
+            raise ValueError("Malformed broadcast header")
+        if self.tick is not None and tick <= self.tick and kind == broadcast_delta:
+            return False
+        if kind == broadcast_delta and keyframe_tick != self.keyframe_tick:
+            return False  # Delta against a keyframe we never received
+
+        offset = broadcast_header.size
+        absolute = {}
+        for _ in range(absolute_count):
+            net_id, x, y, fried = broadcast_chicken.unpack_from(data, offset)
+            absolute[net_id] = (x, y, bool(fried))
+            offset += broadcast_chicken.size
+
+        if kind == broadcast_keyframe:
+            keyframe, chickens = absolute, dict(absolute)
+        else:
+            keyframe, chickens = self.keyframe, dict(self.keyframe)
+            chickens.update(absolute)
+            for _ in range(offset_count):
+                net_id, dx, dy, fried = broadcast_offset.unpack_from(data, offset)
+                base_x, base_y, _ = keyframe[net_id]
+                chickens[net_id] = (base_x + dx * offset_step, base_y + dy * offset_step, bool(fried))
+                offset += broadcast_offset.size
+            for _ in range(removed_count):
+                chickens.pop(broadcast_removed.unpack_from(data, offset)[0], None)
+                offset += broadcast_removed.size
+
+        self.keyframe, self.keyframe_tick = keyframe, keyframe_tick
+        self.chickens = chickens
+        self.tick = tick
+        self.sender_size = (width, height)
+        self.score, self.misses = score, misses
+        self.game_state = broadcast_states[state]
+        return True
@@ -1,11 +1,15 @@
-import random, math
-from io import BytesIO
+import os, random, math, time, heapq, queue, struct, threading
+from array import array
+from collections import deque
 from PIL import Image as PILImage
+from asset_cache import load_cached_frames
+from broadcast import StatePublisher, StateReceiver, parse_address
 
 from kivy.app import App
 from kivy.uix.widget import Widget
 from kivy.uix.label import Label
-from kivy.graphics import Rectangle, Color
+from kivy.graphics import Rectangle, Color, Fbo, ClearColor, ClearBuffers, Mesh
+from kivy.graphics.texture import Texture
 from kivy.core.window import Window
 from kivy.core.audio import SoundLoader
 from kivy.clock import Clock
@@ -16,6 +20,67 @@ from kivy.core.text import Label as CoreLabel
 WIDTH, HEIGHT = Window.width, Window.height
 Window.title = "Chicken Shooter Arcade"
 
+# --- Resource budgets ---
+budgeted_categories = ("background", "labels", "audio")
+
+def parse_budgets(spec):
+    """Parse "category=MB,..." into byte budgets per asset category."""
+    budgets = {}
+    for entry in spec.split(","):
+        if entry.strip():
+            category, megabytes = entry.split("=")
+            category = category.strip()
+            if category not in budgeted_categories:
+                print(f"Ignoring budget for '{category}', only {', '.join(budgeted_categories)} can be budgeted")
+                continue
+            budgets[category] = int(float(megabytes) * 1024 * 1024)
+    return budgets
+
+class ResourceRegistry:
+    """Tracks the bytes held per asset category against optional budgets."""
+    categories = ("background", "sprites", "labels", "audio")
+
+    def __init__(self, budgets):
+        self.budgets = budgets
+        self.entries = {category: {} for category in self.categories}
+
+    def track(self, category, key, nbytes):
+        self.entries[category][key] = nbytes
+
+    def release(self, category, key):
+        self.entries[category].pop(key, None)
+
+    def total(self, category):
+        return sum(self.entries[category].values())
+
+    def over_budget(self, category, extra=0):
+        budget = self.budgets.get(category)
+        return budget is not None and self.total(category) + extra > budget
+
+    def report(self):
+        parts = []
+        for category in self.categories:
+            part = f"{category} {self.total(category) / 1048576:.1f}"
+            if category in self.budgets:
+                part += f"/{self.budgets[category] / 1048576:.1f}"
+            parts.append(part)
+        return "memory MB: " + "  ".join(parts)
+
+# Budgets in MB, e.g. CHICKEN_BUDGETS="background=24,labels=4"; unset means unlimited
+resources = ResourceRegistry(parse_budgets(os.environ.get("CHICKEN_BUDGETS", "")))
+
+# --- Frame textures ---
+# Decoded frames come from the shared cache in asset_cache.py
+def frame_image(frame, size, category, key):
+    """Wrap a raw RGBA frame in a CoreImage backed by a GPU texture."""
+    resources.track(category, key, size[0] * size[1] * 4)
+    texture = Texture.create(size=size, colorfmt="rgba")
+    texture.blit_buffer(frame, colorfmt="rgba", bufferfmt="ubyte")
+    texture.flip_vertical()  # PIL rows run top to bottom
+    # Re-upload from the cached frame if the GL context is recreated
+    texture.add_reload_observer(lambda tex: tex.blit_buffer(frame, colorfmt="rgba", bufferfmt="ubyte"))
+    return CoreImage(texture)
+
 # --- Scale images ---
 def scale_image(path, target_width=None, target_height=None):
     pil_img = PILImage.open(path)
@@ -31,11 +96,8 @@ def scale_image(path, target_width=None, target_height=None):
         ratio = 1
 
     new_size = (int(w * ratio), int(h * ratio))
-    pil_img = pil_img.resize(new_size, PILImage.Resampling.LANCZOS)
-    data = BytesIO()
-    pil_img.save(data, format='png')
-    data.seek(0)
-    return CoreImage(data, ext='png')
+    decode = lambda: [pil_img.convert("RGBA").resize(new_size, PILImage.Resampling.LANCZOS).tobytes()]
+    return frame_image(load_cached_frames(path, new_size, decode)[0], new_size, "sprites", (path, new_size))
 
 # --- Load images ---
 ground_img = scale_image("images/ground.png", target_width=WIDTH)
@@ -51,24 +113,42 @@ fried_chicken_large = scale_image("images/fried_chicken.png", target_height=int(
 
 # --- Load GIF frames ---
 gif_path = "images/bg.gif"
-gif = PILImage.open(gif_path)
-bg_frames = []
-try:
-    while True:
-        frame = gif.copy().convert("RGBA").resize((WIDTH, HEIGHT), PILImage.Resampling.LANCZOS)
-        data = BytesIO()
-        frame.save(data, format='png')
-        data.seek(0)
-        bg_frames.append(CoreImage(data, ext='png'))
-        gif.seek(gif.tell() + 1)
-except EOFError:
-    pass
+
+def decode_gif_frames(size):
+    gif = PILImage.open(gif_path)
+    frames = []
+    try:
+        while True:
+            frame = gif.copy().convert("RGBA").resize(size, PILImage.Resampling.LANCZOS)
+            frames.append(frame.tobytes())
+            gif.seek(gif.tell() + 1)
+    except EOFError:
+        pass
+    return frames
+
+def load_background():
+    """Load background frames, downscaled if full size would exceed the budget."""
+    size = (WIDTH, HEIGHT)
+    full_bytes = PILImage.open(gif_path).n_frames * WIDTH * HEIGHT * 4
+    if resources.over_budget("background", full_bytes):
+        # Frames are stretched to the screen when drawn, so only sharpness is lost
+        scale = max(0.25, math.sqrt(resources.budgets["background"] / full_bytes))
+        size = (max(1, int(WIDTH * scale)), max(1, int(HEIGHT * scale)))
+        print(f"Background downscaled to {size[0]}x{size[1]} to fit memory budget")
+    frames = load_cached_frames(gif_path, size, lambda: decode_gif_frames(size))
+    return [frame_image(frame, size, "background", i) for i, frame in enumerate(frames)]
+
+bg_frames = load_background()
 bg_frame_count = len(bg_frames)
 
 # --- Sounds ---
 jump_sound = SoundLoader.load("sounds/jump.wav")
 hit_sound = SoundLoader.load("sounds/hit.wav")
 failed_sound = SoundLoader.load("sounds/failed.wav")
+for sound, sound_path in [(jump_sound, "sounds/jump.wav"), (hit_sound, "sounds/hit.wav"),
+                          (failed_sound, "sounds/failed.wav")]:
+    if sound:
+        resources.track("audio", sound_path, os.path.getsize(sound_path))
 
 # --- Music playlists ---
 menu_music = [f"sounds/menu{i}.mp3" for i in range(1,4)]
@@ -82,6 +162,7 @@ class MusicManager:
         self.playlist = []
         self.volume = 0.5
         self.state = None  # None, "menu" or "game"
+        self.paused_at = None  # Track position while the window is in the background
 
     def set_volume(self, vol):
         self.volume = max(0.0, min(vol, 1.0))
@@ -102,17 +183,45 @@ class MusicManager:
             attempts += 1
         self.current_index = next_index
 
-        # Stop previous song and unbind callback
+        # Stop previous song, unbind callback and free it right away
+        self.unload_current()
+
+        # Load new song, unless it would push audio past its budget
+        path = self.playlist[self.current_index]
+        track_size = os.path.getsize(path) if os.path.exists(path) else 0
+        if resources.over_budget("audio", track_size):
+            print(f"Skipping music, {os.path.basename(path)} exceeds the audio budget")
+            return
+        self.current_music = SoundLoader.load(path)
         if self.current_music:
+            resources.track("audio", "music", track_size)
+            self.current_music.volume = self.volume
+            self.current_music.bind(on_stop=self._on_music_stop)
+            self.current_music.play()
+
+    def pause(self):
+        """Stop the current track, remembering where to pick it up again."""
+        if self.current_music and self.paused_at is None:
+            self.paused_at = self.current_music.get_pos()
             self.current_music.unbind(on_stop=self._on_music_stop)
             self.current_music.stop()
 
-        # Load new song
-        self.current_music = SoundLoader.load(self.playlist[self.current_index])
-        if self.current_music:
-            self.current_music.volume = self.volume
+    def resume(self):
+        if self.current_music and self.paused_at is not None:
             self.current_music.bind(on_stop=self._on_music_stop)
             self.current_music.play()
+            if self.paused_at:
+                self.current_music.seek(self.paused_at)
+        self.paused_at = None
+
+    def unload_current(self):
+        self.paused_at = None
+        if self.current_music:
+            self.current_music.unbind(on_stop=self._on_music_stop)
+            self.current_music.stop()
+            self.current_music.unload()
+            self.current_music = None
+        resources.release("audio", "music")
 
     def _on_music_stop(self, *args):
         if self.playlist:
@@ -123,10 +232,7 @@ class MusicManager:
         if self.state != new_state:
             self.state = new_state
             # Stop current music first (Extra safeguard)
-            if self.current_music:
-                self.current_music.unbind(on_stop=self._on_music_stop)
-                self.current_music.stop()
-                self.current_music = None
+            self.unload_current()
 
             # Start the new playlist
             if self.state == "menu":
@@ -144,29 +250,150 @@ def set_sfx_volume(vol):
     if hit_sound: hit_sound.volume = 1.2*sfx_volume
     if failed_sound: failed_sound.volume = 1.1*sfx_volume
 
+# --- Label cache ---
+# Static text is rasterized once and its texture reused on every frame.
+# Kept in least-recently-used order so the "labels" budget evicts stale text first
+label_cache = {}
+
+def cached_label(text, font_size, **options):
+    key = (text, font_size, tuple(sorted(options.items())))
+    label = label_cache.pop(key, None)
+    if label is None:
+        label = CoreLabel(text=text, font_size=font_size, **options)
+        label.refresh()
+        width, height = label.texture.size
+        resources.track("labels", key, width * height * 4)
+        while label_cache and resources.over_budget("labels"):
+            oldest = next(iter(label_cache))
+            del label_cache[oldest]
+            resources.release("labels", oldest)
+    label_cache[key] = label
+    return label
+
+# --- Glyph atlas HUD text ---
+# Score and volume readouts change constantly; their characters are rasterized
+# once per font into an atlas and each string is drawn as one Mesh of quads
+hud_charset = "".join(sorted(set("0123456789:% Score Misses Music SFX")))
+glyph_atlases = {}
+
+class GlyphAtlas:
+    """The HUD characters of one font, rendered once into a single texture."""
+    def __init__(self, font_size, **options):
+        # Spaces between glyphs keep neighbouring characters from bleeding together
+        spaced = " ".join(hud_charset)
+        label = CoreLabel(text=spaced, font_size=font_size, **options)
+        label.refresh()
+        self.texture = label.texture
+        self.height = self.texture.height
+        self.space = label.get_extents(" ")[0]
+        self.glyphs = {}  # char -> (advance, tex_coords)
+        for i, char in enumerate(hud_charset):
+            if char == " ":
+                continue
+            left = label.get_extents(spaced[:i * 2])[0] if i else 0
+            width = label.get_extents(char)[0]
+            self.glyphs[char] = (width, self.texture.get_region(left, 0, width, self.height).tex_coords)
+        width, height = self.texture.size
+        resources.track("labels", ("atlas", font_size, tuple(sorted(options.items()))), width * height * 4)
+
+    def measure(self, text):
+        return sum(self.glyphs[char][0] if char in self.glyphs else self.space for char in text)
+
+    def layout(self, text, x, y):
+        """Return (vertices, indices) of one textured quad per glyph."""
+        vertices = []
+        indices = []
+        h = self.height
+        for char in text:
+            glyph = self.glyphs.get(char)
+            if glyph is None:
+                x += self.space
+                continue
+            w, uv = glyph
+            v = len(vertices) // 4
+            vertices += [x, y, uv[0], uv[1], x + w, y, uv[2], uv[3],
+                         x + w, y + h, uv[4], uv[5], x, y + h, uv[6], uv[7]]
+            indices += [v, v + 1, v + 2, v + 2, v + 3, v]
+            x += w
+        return vertices, indices
+
+def glyph_atlas(font_size, **options):
+    key = (font_size, tuple(sorted(options.items())))
+    if key not in glyph_atlases:
+        glyph_atlases[key] = GlyphAtlas(font_size, **options)
+    return glyph_atlases[key]
+
+class HudText:
+    """One line of HUD text; its mesh is only rebuilt when the text or position changes."""
+    def __init__(self, font_size, **options):
+        self.atlas = glyph_atlas(font_size, **options)
+        self.mesh = Mesh(texture=self.atlas.texture, mode="triangles")
+        self.drawn = None
+
+    def draw(self, canvas, text, pos, centered=False):
+        if (text, pos, centered) != self.drawn:
+            x, y = pos
+            if centered:
+                x -= self.atlas.measure(text) // 2
+            self.mesh.vertices, self.mesh.indices = self.atlas.layout(text, x, y)
+            self.drawn = (text, pos, centered)
+        canvas.add(self.mesh)
+
+# --- Difficulty curves ---
+# Spawn limits and chicken speeds are precomputed per score; every curve
+# has flattened out by curve_max_score, later scores reuse the last entry
+curve_max_score = 200
+max_chickens_base = 5
+
+def difficulty_limits(difficulty, score):
+    """Return (max_chickens, spawn_interval) for a difficulty and score."""
+    if difficulty == "Easy":
+        max_chickens = min(int((max_chickens_base / 3) + score // 15), 5)
+        spawn_interval = max(2.0 - score * 0.01, 0.7)
+    elif difficulty == "Medium":
+        max_chickens = min(int((max_chickens_base / 2) + score // 10), 7)
+        spawn_interval = max(1.5 - score * 0.015, 0.5)
+    else:  # Hard
+        max_chickens = min(int((max_chickens_base / 1.5) + score // 7), 10)
+        spawn_interval = max(1.0 - score * 0.02, 0.4)
+    return max_chickens, spawn_interval
+
+def chicken_speeds(score):
+    """Return (base_speed, base_fall, max_drift) for chickens spawned at a score."""
+    return 0.05 + score * 0.001, 5 + score * 0.1, 0.7 + score * 0.0005
+
+difficulty_curves = {
+    level: [difficulty_limits(level, score) for score in range(curve_max_score + 1)]
+    for level in ("Easy", "Medium", "Hard")
+}
+chicken_speed_curve = [chicken_speeds(score) for score in range(curve_max_score + 1)]
+
 # --- Chicken creation ---
+min_jump = int(HEIGHT * 0.317)
+max_jump = int(HEIGHT * 0.733)
+
 def new_chicken(score):
     base_y = 0
-    min_jump = int(HEIGHT * 0.317)
-    max_jump = int(HEIGHT * 0.733)
     jump_height = random.randint(min_jump, max_jump)
 
-    base_speed = 0.05 + score * 0.001
+    # Speeds keep growing with score, so only the table range is looked up
+    if score <= curve_max_score:
+        base_speed, base_fall, max_drift = chicken_speed_curve[score]
+    else:
+        base_speed, base_fall, max_drift = chicken_speeds(score)
+
     speed_variation = random.uniform(-0.005, 0.01)
     jump_speed = max(base_speed + speed_variation, 0.01)
 
-    base_fall = 5 + score * 0.1
     fall_variation = random.uniform(-0.5, 1)
     fall_speed = max(base_fall + fall_variation, 1)
 
-    horizontal_speed = random.uniform(-0.7, 0.7)
-
-    # NEW: small horizontal drift
-    horizontal_speed = random.uniform(-0.7 - score*0.0005, 0.7 + score*0.0005)
+    # Small horizontal drift
+    horizontal_speed = random.uniform(-max_drift, max_drift)
 
     return {
         "x": random.randint(0, WIDTH - chicken_width),
-        "vx": horizontal_speed,   # NEW
+        "vx": horizontal_speed,
         "base_y": base_y,
         "jump_progress": 0,
         "max_jump": jump_height,
@@ -176,25 +403,764 @@ def new_chicken(score):
         "shot": False,
         "hit_time": None,
         "jump_sound_played": False,
-        "current_y": base_y
+        "current_y": base_y,
+        "hit_trace": None
     }
 
+# --- Spawn scheduler ---
+def parse_waves(spec):
+    """Parse "score:count:seconds,..." into a sorted list of scripted waves."""
+    waves = []
+    for entry in spec.split(","):
+        if entry.strip():
+            score, count, seconds = entry.split(":")
+            waves.append((int(score), int(count), float(seconds)))
+    return sorted(waves)
+
+# Scripted waves, e.g. CHICKEN_WAVES="50:20:1,100:50:1" spawns 50 chickens
+# over one second once the score reaches 100
+scripted_waves = parse_waves(os.environ.get("CHICKEN_WAVES", ""))
+
+class SpawnScheduler:
+    """Priority-queue timeline of upcoming spawn events."""
+    def __init__(self, waves=scripted_waves):
+        self.waves = waves
+        self.reset("Medium")
+
+    def reset(self, difficulty):
+        self.time = 0.0
+        self.timeline = []
+        self.sequence = 0
+        self.waiting = False  # A regular spawn is due but the screen is full
+        self.next_wave = 0
+        self.push(difficulty_curves[difficulty][0][1], "regular")
+
+    def push(self, delay, kind):
+        self.sequence += 1
+        heapq.heappush(self.timeline, (self.time + delay, self.sequence, kind))
+
+    def schedule_burst(self, count, duration, delay=0):
+        """Spawn `count` chickens evenly over `duration` seconds, ignoring the cap."""
+        for i in range(count):
+            self.push(delay + duration * i / count, "wave")
+
+    def limits(self, game):
+        return difficulty_curves[game.current_difficulty][min(game.score, curve_max_score)]
+
+    def spawn_regular(self, game):
+        game.chickens.append(new_chicken(game.score))
+        self.waiting = False
+        self.push(self.limits(game)[1], "regular")
+
+    def update(self, dt, game):
+        self.time += dt
+
+        if self.next_wave < len(self.waves) and game.score >= self.waves[self.next_wave][0]:
+            _, count, duration = self.waves[self.next_wave]
+            self.schedule_burst(count, duration)
+            self.next_wave += 1
+
+        while self.timeline and self.timeline[0][0] <= self.time:
+            _, _, kind = heapq.heappop(self.timeline)
+            if kind == "wave":
+                game.chickens.append(new_chicken(game.score))
+            elif len(game.chickens) < self.limits(game)[0]:
+                self.spawn_regular(game)
+            else:
+                self.waiting = True
+
+        if self.waiting and len(game.chickens) < self.limits(game)[0]:
+            self.spawn_regular(game)
+
+# --- Lag-compensated hit detection ---
+# How far back (seconds) a touch may be rewound to find what was on screen,
+# e.g. CHICKEN_HIT_REWIND=0.25; 0 hit-tests against the latest drawn frame
+hit_rewind_window = float(os.environ.get("CHICKEN_HIT_REWIND", "0.15"))
+
+class PositionHistory:
+    """Ring buffer of chicken positions recorded once per simulation tick."""
+    def __init__(self, rewind_window=hit_rewind_window, tick_rate=30):
+        self.rewind_window = rewind_window
+        self.ticks = deque(maxlen=max(2, int(math.ceil(rewind_window * tick_rate)) + 1))
+
+    def clear(self):
+        self.ticks.clear()
+
+    def record(self, timestamp, chickens):
+        self.ticks.append((timestamp, [(c, c["x"], c["current_y"]) for c in chickens]))
+
+    def lookup(self, timestamp, now):
+        """Return {id(chicken): (x, y)} as drawn at `timestamp`, or None."""
+        if not self.ticks:
+            return None
+        # Never rewind further than the configured window
+        timestamp = max(timestamp, now - self.rewind_window)
+        snapshot = None
+        for tick_time, positions in self.ticks:
+            if tick_time > timestamp:
+                break
+            snapshot = positions
+        if snapshot is None:
+            snapshot = self.ticks[0][1]
+        return {id(c): (x, y) for c, x, y in snapshot}
+
+# --- Chicken collisions ---
+# Set CHICKEN_COLLISIONS=1 to let chickens bounce off each other
+chicken_collisions = os.environ.get("CHICKEN_COLLISIONS") == "1"
+collision_push = 2  # max pixels per tick overlapping chickens are eased apart
+
+def collide_chickens(chickens):
+    """Deflect overlapping chickens, using a sweep-and-prune pass sorted by x."""
+    active = []
+    for chicken in sorted(chickens, key=lambda c: c["x"]):
+        x = chicken["x"]
+        # Prune chickens that end before this one starts
+        active = [other for other in active if other["x"] + chicken_width > x]
+        for other in active:
+            # `other` is on the left, so they only collide while closing in
+            if other["vx"] > chicken["vx"] and abs(other["current_y"] - chicken["current_y"]) < chicken_height:
+                other["vx"], chicken["vx"] = chicken["vx"], other["vx"]
+                # Ease them apart instead of snapping out of the whole overlap
+                push = min((other["x"] + chicken_width - chicken["x"]) / 2, collision_push)
+                other["x"] = max(0, other["x"] - push)
+                chicken["x"] = min(WIDTH - chicken_width, chicken["x"] + push)
+        active.append(chicken)
+
+# --- Hit particles ---
+max_particles = 600  # hard cap; once full, slots are recycled in turn
+particles_per_hit = 24
+particle_life = 0.6
+particle_gravity = HEIGHT * 1.5
+
+class ParticleSystem:
+    """Feathers and sparks kept in preallocated arrays and drawn as one Mesh.
+
+    Live particles are packed into the first `active` slots, so updates never
+    visit dead ones.
+    """
+    def __init__(self, capacity=max_particles):
+        self.capacity = capacity
+        self.x = array("f", [0.0]) * capacity
+        self.y = array("f", [0.0]) * capacity
+        self.vx = array("f", [0.0]) * capacity
+        self.vy = array("f", [0.0]) * capacity
+        self.life = array("f", [0.0]) * capacity
+        self.size = array("f", [0.0]) * capacity
+        self.next_slot = 0  # Ring cursor for recycling once every slot is live
+        self.active = 0
+        self.drawn = 0  # Particles the mesh indices currently cover
+        # Four (x, y, u, v) vertices and two triangles per particle; u and v stay 0
+        self.vertices = [0.0] * (capacity * 16)
+        self.indices = []
+        for i in range(capacity):
+            v = i * 4
+            self.indices += [v, v + 1, v + 2, v + 2, v + 3, v]
+        self.mesh = Mesh(vertices=[], indices=[], mode="triangles")
+
+    def clear(self):
+        self.active = 0
+        self.drawn = 0
+        self.mesh.vertices = []
+        self.mesh.indices = []
+
+    def emit(self, x, y, count=particles_per_hit):
+        for _ in range(count):
+            if self.active < self.capacity:
+                i = self.active
+                self.active += 1
+            else:
+                i = self.next_slot
+                self.next_slot = (i + 1) % self.capacity
+            angle = random.uniform(0, math.pi * 2)
+            speed = random.uniform(0.2, 1.0) * HEIGHT * 0.6
+            self.x[i] = x
+            self.y[i] = y
+            self.vx[i] = math.cos(angle) * speed
+            self.vy[i] = math.sin(angle) * speed
+            self.life[i] = particle_life * random.uniform(0.5, 1.0)
+            # Mostly small sparks with a few larger feathers
+            self.size[i] = HEIGHT * (0.025 if random.random() < 0.3 else 0.008)
+
+    def update(self, dt):
+        """Advance the live particles and rewrite their mesh vertices in place."""
+        n = self.active
+        if not n:
+            return
+        x, y, vx, vy, life, size = self.x, self.y, self.vx, self.vy, self.life, self.size
+        vertices = self.vertices
+        fall = particle_gravity * dt
+        i = 0
+        while i < n:
+            remaining = life[i] - dt
+            if remaining <= 0:
+                # Move the last live particle into this slot and look at it next
+                n -= 1
+                x[i], y[i], vx[i], vy[i], life[i], size[i] = x[n], y[n], vx[n], vy[n], life[n], size[n]
+                continue
+            life[i] = remaining
+            vy[i] -= fall
+            px = x[i] = x[i] + vx[i] * dt
+            py = y[i] = y[i] + vy[i] * dt
+            half = size[i] * remaining / particle_life
+            left, right, bottom, top = px - half, px + half, py - half, py + half
+            v = i * 16
+            vertices[v] = left
+            vertices[v + 1] = bottom
+            vertices[v + 4] = right
+            vertices[v + 5] = bottom
+            vertices[v + 8] = right
+            vertices[v + 9] = top
+            vertices[v + 12] = left
+            vertices[v + 13] = top
+            i += 1
+        self.active = n
+        if n != self.drawn:
+            self.drawn = n
+            self.mesh.indices = self.indices[:n * 6]
+        self.mesh.vertices = vertices[:n * 16]
+
+# --- Game state snapshots ---
+# Compact binary save of an in-progress game, written on pause and every few
+# seconds of play, and restored at startup. The frame thread only copies the
+# state; packing and the file write happen on SnapshotWriter. Layout (little-endian):
+#   header, then one record per scheduled spawn event, then one per chicken
+snapshot_magic = b"CSSN"
+snapshot_version = 1
+snapshot_interval = 5.0
+snapshot_header = struct.Struct("<4sHIIB?d?III")
+snapshot_event = struct.Struct("<dB")
+snapshot_chicken = struct.Struct("<8dBB")
+snapshot_states = ["jumping", "hit"]
+snapshot_state_codes = {state: i for i, state in enumerate(snapshot_states)}
+snapshot_event_kinds = ["regular", "wave"]
+
+def capture_snapshot(game):
+    """Copy the state a snapshot needs, so it can be packed away from the frame thread."""
+    scheduler = game.spawn_scheduler
+    return ((game.score, game.misses, game.current_difficulty_index, game.miss_sound_played,
+             scheduler.time, scheduler.waiting, scheduler.next_wave),
+            list(scheduler.timeline),
+            [c.copy() for c in game.chickens if c["state"] != "done"])
+
+def pack_snapshot(captured):
+    """Serialize a captured game into snapshot bytes."""
+    values, timeline, chickens = captured
+    data = bytearray(snapshot_header.size + len(timeline) * snapshot_event.size
+                     + len(chickens) * snapshot_chicken.size)
+    snapshot_header.pack_into(data, 0, snapshot_magic, snapshot_version, *values, len(timeline), len(chickens))
+    offset = snapshot_header.size
+    for event_time, _, kind in timeline:
+        snapshot_event.pack_into(data, offset, event_time, snapshot_event_kinds.index(kind))
+        offset += snapshot_event.size
+    pack_chicken = snapshot_chicken.pack_into
+    for c in chickens:
+        pack_chicken(data, offset, c["x"], c["vx"], c["base_y"], c["jump_progress"], c["max_jump"],
+                     c["jump_speed"], c["fall_speed"], c["current_y"],
+                     snapshot_state_codes[c["state"]], c["shot"] | (c["jump_sound_played"] << 1))
+        offset += snapshot_chicken.size
+    return bytes(data)
+
+def unpack_snapshot(game, data):
+    """Restore a game from snapshot bytes; raises ValueError if they don't fit."""
+    if len(data) < snapshot_header.size:
+        raise ValueError("Snapshot is truncated")
+    (magic, version, score, misses, difficulty_index, miss_sound_played, scheduler_time,
+     waiting, next_wave, event_count, chicken_count) = snapshot_header.unpack_from(data)
+    if magic != snapshot_magic or version != snapshot_version:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    events_end = snapshot_header.size + event_count * snapshot_event.size
+    if len(data) != events_end + chicken_count * snapshot_chicken.size:
+        raise ValueError("Snapshot size does not match its header")
+
+    game.score, game.misses = score, misses
+    game.current_difficulty_index = difficulty_index % len(game.difficulty_levels)
+    game.current_difficulty = game.difficulty_levels[game.current_difficulty_index]
+    game.miss_sound_played = miss_sound_played
+
+    scheduler = game.spawn_scheduler
+    scheduler.time, scheduler.waiting, scheduler.next_wave = scheduler_time, waiting, next_wave
+    scheduler.timeline = [(event_time, i, snapshot_event_kinds[kind]) for i, (event_time, kind)
+                          in enumerate(snapshot_event.iter_unpack(data[snapshot_header.size:events_end]))]
+    heapq.heapify(scheduler.timeline)
+    scheduler.sequence = event_count
+
+    game.chickens = []
+    for (x, vx, base_y, jump_progress, jump_height, jump_speed, fall_speed, current_y,
+         state, flags) in snapshot_chicken.iter_unpack(data[events_end:]):
+        game.chickens.append({
+            "x": x,
+            "vx": vx,
+            "base_y": base_y,
+            "jump_progress": jump_progress,
+            "max_jump": jump_height,
+            "jump_speed": jump_speed,
+            "fall_speed": fall_speed,
+            "state": snapshot_states[state],
+            "shot": bool(flags & 1),
+            "hit_time": None,
+            "jump_sound_played": bool(flags & 2),
+            "current_y": current_y,
+            "hit_trace": None
+        })
+
+class SnapshotWriter(threading.Thread):
+    """Packs and writes snapshots off the game thread, in the order they were requested."""
+    def __init__(self, path):
+        super().__init__(daemon=True)
+        self.path = path
+        self.requests = queue.Queue()  # captured snapshot to save, False to delete, None to stop
+
+    def run(self):
+        while True:
+            captured = self.requests.get()
+            if captured is None:
+                return
+            try:
+                if captured:
+                    self.write(pack_snapshot(captured))
+                elif os.path.exists(self.path):
+                    os.remove(self.path)
+            except OSError as e:
+                print(f"Could not save snapshot: {e}")
+
+    def write(self, data):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+# --- Spectator broadcast ---
+# Set CHICKEN_PUBLISH=host:port to stream state, CHICKEN_VIEWER=[host]:port to watch it
+publish_address = os.environ.get("CHICKEN_PUBLISH")
+viewer_address = os.environ.get("CHICKEN_VIEWER")
+
+# --- Idle throttling ---
+# Seconds between updates while the window is visible but unfocused
+idle_update_interval = 1.0
+
+# --- Timers ---
+class TimerWheel:
+    """Hashed timer wheel: each tick only visits the one slot that comes due."""
+    def __init__(self, tick=1/30, size=64):
+        self.tick = tick
+        self.slots = [[] for _ in range(size)]
+        self.position = 0
+        self.pending = 0.0
+
+    def schedule(self, delay, callback, repeat=False):
+        timer = {"callback": callback, "interval": delay if repeat else None, "cancelled": False}
+        self.insert(timer, delay)
+        return timer
+
+    def insert(self, timer, delay):
+        ticks = max(1, int(round(delay / self.tick)))
+        timer["rounds"] = (ticks - 1) // len(self.slots)
+        self.slots[(self.position + ticks) % len(self.slots)].append(timer)
+
+    def advance(self, dt):
+        self.pending += dt
+        # Small tolerance so a frame of ~1/30 s still counts as one tick
+        while self.pending >= self.tick - 1e-4:
+            self.pending -= self.tick
+            self.position = (self.position + 1) % len(self.slots)
+            slot = self.slots[self.position]
+            if not slot:
+                continue
+            self.slots[self.position] = []
+            due = []
+            for timer in slot:
+                if timer["cancelled"]:
+                    continue
+                if timer["rounds"]:
+                    timer["rounds"] -= 1
+                    self.slots[self.position].append(timer)
+                else:
+                    due.append(timer)
+            for timer in due:
+                # An earlier callback may have cancelled this one
+                if timer["cancelled"]:
+                    continue
+                if timer["interval"] is not None:
+                    self.insert(timer, timer["interval"])
+                timer["callback"]()
+
+class GameTimers:
+    """One timer wheel per game_state; only the current state's wheel advances."""
+    def __init__(self):
+        self.wheels = {}
+
+    def schedule(self, delay, callback, states, repeat=False):
+        """Schedule `callback` on each state's wheel; returns handles for cancel()."""
+        return [self.wheels.setdefault(state, TimerWheel()).schedule(delay, callback, repeat)
+                for state in states]
+
+    def cancel(self, timers):
+        for timer in timers or ():
+            timer["cancelled"] = True
+
+    def advance(self, dt, game_state):
+        wheel = self.wheels.get(game_state)
+        if wheel:
+            wheel.advance(dt)
+
+# --- Profiler ---
+# Set CHICKEN_PROFILE=1 to print frame time and input latency stats
+profiler_enabled = os.environ.get("CHICKEN_PROFILE") == "1"
+# Queue gameplay touches and resolve them at the start of the simulation step
+batch_touches = os.environ.get("CHICKEN_BATCH_TOUCHES") == "1"
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def process_memory_mb():
+    """Resident memory of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1048576
+    except (OSError, ValueError, IndexError):
+        return None
+
+class Profiler:
+    """Collects frame times and input latencies and prints a periodic report."""
+    # "flip" is the buffer swap that puts the fried chicken on screen
+    latency_stages = ("touch->handler", "handler->hit", "hit->flip", "touch->flip")
+
+    def __init__(self, report_interval=5.0):
+        self.enabled = profiler_enabled
+        self.report_interval = report_interval
+        self.last_report = time.time()
+        self.frame_times = deque(maxlen=600)
+        self.latencies = {stage: deque(maxlen=500) for stage in self.latency_stages}
+        self.reporters = []  # Callables returning extra report lines
+        self.drawn_traces = []  # Traces whose fried sprite is in the canvas, waiting for the flip
+        if self.enabled:
+            Window.bind(on_flip=self.on_flip)
+
+    def frame(self, dt):
+        if not self.enabled:
+            return
+        self.frame_times.append(dt)
+        now = time.time()
+        if now - self.last_report >= self.report_interval:
+            self.last_report = now
+            print("\n".join(self.report()))
+
+    def trace_drawn(self, trace):
+        """The fried sprite for this trace was added to the canvas; stamp it on the next flip."""
+        self.drawn_traces.append(trace)
+
+    def on_flip(self, *args):
+        if not self.drawn_traces:
+            return
+        now = time.time()
+        for trace in self.drawn_traces:
+            trace["frame"] = now
+            self.add_input_trace(trace)
+        self.drawn_traces = []
+
+    def add_input_trace(self, trace):
+        """Record the stage latencies of a completed touch trace."""
+        if not self.enabled:
+            return
+        self.latencies["touch->handler"].append(trace["handler"] - trace["touch"])
+        if "hit" in trace:
+            self.latencies["handler->hit"].append(trace["hit"] - trace["handler"])
+        if "frame" in trace:
+            self.latencies["hit->flip"].append(trace["frame"] - trace["hit"])
+            self.latencies["touch->flip"].append(trace["frame"] - trace["touch"])
+
+    def report(self):
+        lines = ["--- Profiler ---"]
+        if self.frame_times:
+            frame_ms = [t * 1000 for t in self.frame_times]
+            lines.append(f"frame ms: avg {sum(frame_ms)/len(frame_ms):.1f}  "
+                         f"p95 {percentile(frame_ms, 95):.1f}  max {max(frame_ms):.1f}")
+        for stage in self.latency_stages:
+            samples = [t * 1000 for t in self.latencies[stage]]
+            if samples:
+                lines.append(f"{stage} ms: p50 {percentile(samples, 50):.1f}  "
+                             f"p95 {percentile(samples, 95):.1f}  p99 {percentile(samples, 99):.1f}  "
+                             f"(n={len(samples)})")
+        lines.append(resources.report())
+        rss = process_memory_mb()
+        if rss is not None:
+            lines.append(f"process rss MB: {rss:.1f}")
+        for reporter in self.reporters:
+            lines += reporter()
+        return lines
+
+# --- Session telemetry ---
+# Set CHICKEN_TELEMETRY=/path/telemetry.csv to log per-session analytics
+telemetry_path = os.environ.get("CHICKEN_TELEMETRY")
+telemetry_capacity = 4096  # records kept per session before the oldest are overwritten
+telemetry_record = struct.Struct("<fBfBI")  # session time, event, value, difficulty, score
+telemetry_events = ["hit", "miss", "tap_miss"]
+telemetry_columns = "session,time,event,value,difficulty,score\n"
+
+class TelemetryRing:
+    """Fixed-size ring of packed event records."""
+    def __init__(self, capacity=telemetry_capacity):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * telemetry_record.size)
+        self.count = 0  # Records added since the last drain, including overwritten ones
+
+    def add(self, t, event, value, difficulty, score):
+        offset = (self.count % self.capacity) * telemetry_record.size
+        telemetry_record.pack_into(self.buffer, offset, t, event, value, difficulty, score)
+        self.count += 1
+
+    def drain(self):
+        """Return (records oldest first, number overwritten) and empty the ring."""
+        size = telemetry_record.size
+        if self.count <= self.capacity:
+            data = bytes(self.buffer[:self.count * size])
+        else:
+            start = (self.count % self.capacity) * size
+            data = bytes(self.buffer[start:] + self.buffer[:start])
+        dropped = max(0, self.count - self.capacity)
+        self.count = 0
+        return data, dropped
+
+class TelemetryWriter(threading.Thread):
+    """Appends drained sessions to a CSV file off the game thread."""
+    def __init__(self, path):
+        super().__init__(daemon=True)
+        self.path = path
+        self.batches = queue.Queue()
+
+    def run(self):
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                return
+            try:
+                self.write(*batch)
+            except OSError as e:
+                print(f"Could not write telemetry: {e}")
+
+    def write(self, session, data, summary):
+        new_file = not os.path.exists(self.path)
+        rows = [f"{session},{t:.3f},{telemetry_events[event]},{value:.4f},{difficulty},{score}\n"
+                for t, event, value, difficulty, score in telemetry_record.iter_unpack(data)]
+        rows += [f"{session},,{name},{value:.4f},,\n" for name, value in summary]
+        with open(self.path, "a") as f:
+            if new_file:
+                f.write(telemetry_columns)
+            f.writelines(rows)
+
+class SessionTelemetry:
+    """Collects one game session in memory and hands it to the writer when it ends."""
+    def __init__(self, path):
+        self.ring = TelemetryRing()
+        self.writer = TelemetryWriter(path)
+        self.writer.start()
+        self.session = f"{int(time.time())}-{os.getpid()}"
+        self.sessions = 0
+        self.active = False
+
+    def start(self):
+        self.active = True
+        self.sessions += 1
+        self.started = time.time()
+        self.frame_histogram = array("I", [0]) * 250  # 1 ms buckets, last one catches the rest
+        self.frame_count = 0
+        self.frame_total = 0.0
+        self.frame_max = 0.0
+
+    def record(self, event, value, game):
+        if self.active:
+            self.ring.add(time.time() - self.started, telemetry_events.index(event), value,
+                          game.current_difficulty_index, game.score)
+
+    def frame(self, dt):
+        if not self.active:
+            return
+        ms = dt * 1000
+        self.frame_histogram[min(int(ms), len(self.frame_histogram) - 1)] += 1
+        self.frame_count += 1
+        self.frame_total += ms
+        self.frame_max = max(self.frame_max, ms)
+
+    def frame_percentile(self, pct):
+        target = self.frame_count * pct / 100
+        seen = 0
+        for ms, count in enumerate(self.frame_histogram):
+            seen += count
+            if seen >= target:
+                return ms + 1
+        return len(self.frame_histogram)
+
+    def end(self, game):
+        if not self.active:
+            return
+        self.active = False
+        data, dropped = self.ring.drain()
+        summary = [("session_length", time.time() - self.started),
+                   ("final_score", game.score),
+                   ("final_misses", game.misses),
+                   ("frame_avg_ms", self.frame_total / max(1, self.frame_count)),
+                   ("frame_p95_ms", self.frame_percentile(95)),
+                   ("frame_max_ms", self.frame_max),
+                   ("dropped_records", dropped)]
+        self.writer.batches.put((f"{self.session}-{self.sessions}", data, summary))
+
+    def close(self, game):
+        self.end(game)
+        self.writer.batches.put(None)
+        self.writer.join(timeout=2)
+
+# --- Bot player ---
+def parse_bot_options(spec):
+    """Parse "accuracy=0.8,reaction=0.3,tps=3" into BotPlayer keyword arguments."""
+    names = {"accuracy": "accuracy", "reaction": "reaction_delay", "tps": "taps_per_second"}
+    options = {}
+    for entry in spec.split(","):
+        if "=" in entry:
+            name, value = entry.split("=")
+            options[names[name.strip()]] = float(value)
+    return options
+
+# Set CHICKEN_BOT=1 (or CHICKEN_BOT="accuracy=0.8,reaction=0.3,tps=3") to let a bot play
+bot_spec = os.environ.get("CHICKEN_BOT")
+
+class BotTouch:
+    """Just enough of a Kivy touch for the game's touch handlers."""
+    def __init__(self, pos):
+        self.pos = pos
+        self.x, self.y = pos
+        self.time_start = time.time()
+
+class BotPlayer:
+    """Plays unattended through the normal touch handlers, including the Retry loop."""
+    def __init__(self, game, accuracy=0.8, reaction_delay=0.3, taps_per_second=3.0):
+        self.game = game
+        self.accuracy = accuracy
+        self.reaction_delay = reaction_delay
+        self.taps_per_second = taps_per_second
+        self.clock = 0.0
+        self.tap_allowance = 0.0
+        self.seen = {}  # id(chicken) -> (chicken, time it was first seen)
+        self.taps = 0
+        self.games = 0
+        self.last_state = None
+        self.state_since = 0.0
+
+    def tap(self, x, y):
+        touch = BotTouch((x, y))
+        self.game.on_touch_down(touch)
+        self.game.on_touch_up(touch)
+        self.taps += 1
+
+    def tap_button(self, name):
+        pos = getattr(self.game, name + "_pos", None)
+        size = getattr(self.game, name + "_size", None)
+        if pos and size:
+            self.tap(pos[0] + size[0] / 2, pos[1] + size[1] / 2)
+            return True
+        return False
+
+    def update(self, dt):
+        game = self.game
+        if game.idle_mode:
+            return  # The window is in the background, leave the game alone
+        self.clock += dt
+        self.tap_allowance = min(1.0, self.tap_allowance + dt * self.taps_per_second)
+        if game.game_state != self.last_state:
+            if game.game_state == "gameover":
+                self.games += 1
+                print(f"Bot: game {self.games} over with score {game.score}")
+            self.last_state = game.game_state
+            self.state_since = self.clock
+        # Menus get the same reaction delay as chickens
+        if self.clock - self.state_since < self.reaction_delay or self.tap_allowance < 1.0:
+            return
+
+        if game.game_state == "home":
+            tapped = self.tap_button("start_button")
+        elif game.game_state == "gameover":
+            tapped = self.tap_button("retry_button")
+        elif game.game_state == "paused":
+            tapped = self.tap_button("resume_button")
+        elif game.game_state == "playing":
+            tapped = self.shoot()
+        else:
+            return
+        # Only a real tap uses up the allowance, so the next target isn't delayed
+        if tapped:
+            self.tap_allowance = 0.0
+
+    def shoot(self):
+        seen = {}
+        target = None
+        for chicken in self.game.chickens:
+            if chicken["state"] != "jumping":
+                continue
+            entry = self.seen.get(id(chicken)) or (chicken, self.clock)
+            seen[id(chicken)] = entry
+            # Oldest chicken the bot has had time to react to, clear of the ground
+            reacted = self.clock - entry[1] >= self.reaction_delay
+            if reacted and chicken["current_y"] > HEIGHT * 0.1 and (target is None or entry[1] < target[1]):
+                target = entry
+        self.seen = seen
+        if target is None:
+            return False
+
+        chicken = target[0]
+        x = chicken["x"] + chicken_width / 2
+        y = chicken["current_y"] + chicken_height / 2
+        if random.random() >= self.accuracy:
+            x += random.choice([-1, 1]) * chicken_width * random.uniform(1.2, 2.0)
+        self.tap(x, y)
+        return True
+
+    def report(self):
+        return [f"bot: {self.games} games, {self.taps} taps, score {self.game.score}"]
+
 def reset_game(game):
+    if game.telemetry:
+        game.telemetry.end(game)
     game.score = 0
     game.misses = 0
-    game.spawn_timer = 0
+    game.spawn_scheduler.reset(game.current_difficulty)
     game.chickens = [new_chicken(0)]
     game.miss_sound_played = False
+    game.position_history.clear()
+    game.touch_queue.clear()
+    game.particles.clear()
+    game.delete_snapshot()
 
 # --- Main Game Widget ---
 class GameWidget(Widget):
-    def __init__(self, **kwargs):
+    def __init__(self, snapshot_path=None, **kwargs):
         super().__init__(**kwargs)
+        self.snapshot_path = snapshot_path
+        self.snapshot_writer = SnapshotWriter(snapshot_path) if snapshot_path else None
+        if self.snapshot_writer:
+            self.snapshot_writer.start()
+        self.publisher = StatePublisher(parse_address(publish_address), (WIDTH, HEIGHT)) if publish_address else None
+        self.bot = None
+        self.telemetry = SessionTelemetry(telemetry_path) if telemetry_path else None
+        # Constantly changing HUD text, drawn from glyph atlases
+        self.score_text = HudText(int(HEIGHT * 0.04), color=(1,0,0,1))
+        self.settings_music_text = HudText(int(HEIGHT*0.03), color=(0, 0, 0, 1))
+        self.settings_sfx_text = HudText(int(HEIGHT*0.03), color=(0, 0, 0, 1))
+        self.pause_music_text = HudText(int(HEIGHT*0.03))
+        self.pause_sfx_text = HudText(int(HEIGHT*0.03))
         self.bg_index = 0
-        self.bg_timer = 0
+        self.timers = GameTimers()
+        # Background GIF runs at 10 fps on every screen except loading and pause
+        self.timers.schedule(1/10, self.advance_background,
+                             ("home", "about", "settings", "playing", "gameover"), repeat=True)
         self.chickens = [new_chicken(0)]
-        self.spawn_timer = 0
-        self.max_chickens_base = 5
+        self.position_history = PositionHistory()
+        self.profiler = Profiler()
+        self.touch_queue = []
+        self.particles = ParticleSystem()
+        self.spawn_scheduler = SpawnScheduler()
         self.max_misses = 100
         self.score = 0
         self.misses = 0
@@ -205,11 +1171,18 @@ class GameWidget(Widget):
         self.music_manager.switch_state("menu")
         # --- Home menu chicken interaction ---
         self.home_chicken_pos = (WIDTH//2 - chicken_width//2, int(HEIGHT * 0.25))
-        self.home_chicken_hold_time = 0
+        self.home_chicken_hold_timer = None
         self.home_chicken_holding = False
         self.home_chicken_cooked = False
-        self.home_chicken_cook_timer = 0
-        Clock.schedule_interval(self.update, 1/30)
+        self.home_chicken_cook_timer = None
+        self.update_event = Clock.schedule_interval(self.update, 1/30)
+        # None while active, "unfocused" (slow updates) or "minimized" (no updates)
+        self.idle_mode = None
+        Window.bind(on_minimize=lambda *args: self.set_idle("minimized"),
+                    on_hide=lambda *args: self.set_idle("minimized"),
+                    on_restore=lambda *args: self.set_idle(None),
+                    on_show=lambda *args: self.set_idle(None),
+                    focus=self.on_window_focus)
         self.difficulty_levels = ["Easy", "Medium", "Hard"]
         self.current_difficulty_index = 1  # Medium
         self.current_difficulty = self.difficulty_levels[self.current_difficulty_index]
@@ -221,6 +1194,8 @@ class GameWidget(Widget):
         self.slider_width = int(WIDTH * 0.25)
         self.slider_height = int(HEIGHT * 0.03)
         self.active_slider = None  # None, "sfx" or "music"
+        self.pause_fbo = None  # Frozen gameplay + static pause menu, built on entering pause
+        self.pause_drawn_volumes = None
         self.about_texts = [
             "Chicken Shooter Arcade",
             "Made by Jamshid Farook",
@@ -235,12 +1210,17 @@ class GameWidget(Widget):
             self.load_images,
             self.fake_step,
             self.load_sounds,
-            self.fake_step,
+            self.warm_up_screens,
             self.finish_loading
         ]
         self.current_loading_step = 0
         Clock.schedule_interval(self.run_loading_step, 0.15)
 
+        if bot_spec:
+            self.bot = BotPlayer(self, **parse_bot_options(bot_spec))
+            self.profiler.reporters.append(self.bot.report)
+            Clock.schedule_interval(self.bot.update, 1/30)
+
     def run_loading_step(self, dt):
         if self.current_loading_step < len(self.loading_steps):
             self.loading_steps[self.current_loading_step]()
@@ -258,9 +1238,146 @@ class GameWidget(Widget):
     def load_sounds(self):
         print("Sounds Loaded")
 
+    def screen_labels(self):
+        """Static labels drawn by each screen, as (text, font_size, options)."""
+        title_size = int(HEIGHT * 0.08)
+        button_size = int(HEIGHT * 0.04)
+        red = {"color": (1,0,0,1)}
+        difficulties = [(level, button_size, {}) for level in self.difficulty_levels]
+        return {
+            "home": [("Chicken Shooter Arcade", title_size, red), ("Start Game", button_size, {}),
+                     ("Settings", button_size, {}), ("About", button_size, {})],
+            "about": [(text, int(HEIGHT*0.06), {"bold": True, "color": (0,0,0,1)}) for text in self.about_texts]
+                     + [("Back", button_size, {})],
+            "settings": [("Settings", title_size, red), ("Back", button_size, {})] + difficulties,
+            "gameover": [("Game Over!", title_size, red), ("Retry", button_size, {}),
+                         ("Home", button_size, {})] + difficulties,
+            "playing": [("Pause", int(HEIGHT*0.03), {})],
+            "paused": [("Paused", title_size, red), ("Resume", int(HEIGHT*0.05), {}),
+                       ("Exit", int(HEIGHT*0.05), {})],
+        }
+
+    def warm_up_screens(self):
+        """Rasterize every screen's static content offscreen so first visits don't hitch."""
+        fbo = Fbo(size=(WIDTH, HEIGHT))
+        with fbo:
+            # Touch every sprite and label texture once so it gets uploaded now
+            for img in [ground_img, chicken_img, chicken_large, fried_chicken_small, fried_chicken_large] + bg_frames:
+                Rectangle(texture=img.texture, pos=(0, 0), size=(img.width, img.height))
+            for labels in self.screen_labels().values():
+                for text, font_size, options in labels:
+                    label = cached_label(text, font_size, **options)
+                    Rectangle(texture=label.texture, pos=(0, 0), size=label.texture.size)
+        fbo.draw()
+        fbo.clear()
+        print("Screens Warmed Up")
+
     def finish_loading(self):
         print("Loading Finished")
-        Clock.schedule_once(lambda dt: setattr(self, "game_state", "home"), 0.4)
+        # An interrupted game comes back on its pause menu
+        next_state = "paused" if self.restore_snapshot() else "home"
+        self.timers.schedule(0.4, lambda: setattr(self, "game_state", next_state), ("loading",))
+        if self.snapshot_path:
+            self.timers.schedule(snapshot_interval, self.save_snapshot, ("playing",), repeat=True)
+
+    def save_snapshot(self):
+        if self.snapshot_writer:
+            self.snapshot_writer.requests.put(capture_snapshot(self))
+
+    def restore_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                unpack_snapshot(self, f.read())
+        except (OSError, ValueError, IndexError, struct.error) as e:
+            print(f"Ignoring snapshot: {e}")
+            self.delete_snapshot()
+            reset_game(self)
+            return False
+        print("Snapshot Restored")
+        return True
+
+    def delete_snapshot(self):
+        # Queued behind pending saves so an older save can't bring the file back
+        if self.snapshot_writer:
+            self.snapshot_writer.requests.put(False)
+
+    def shutdown(self):
+        """Called when the app exits: flush the current telemetry session and pending snapshots."""
+        if self.telemetry:
+            self.telemetry.close(self)
+        if self.snapshot_writer:
+            self.snapshot_writer.requests.put(None)
+            self.snapshot_writer.join(timeout=2)
+
+    def pause_game(self):
+        self.game_state = "paused"
+        self.save_snapshot()
+
+    def on_window_focus(self, window, focused):
+        if focused:
+            self.set_idle(None)
+        elif self.idle_mode != "minimized":
+            self.set_idle("unfocused")
+
+    def set_idle(self, mode):
+        """Throttle the game while the window is in the background, restore it on return."""
+        if mode == self.idle_mode:
+            return
+        if mode and self.game_state == "playing":
+            self.pause_game()
+        if self.idle_mode is None:
+            self.music_manager.pause()
+        elif mode is None:
+            self.music_manager.resume()
+        self.idle_mode = mode
+
+        if self.update_event:
+            self.update_event.cancel()
+            self.update_event = None
+        if mode is None:
+            self.update_event = Clock.schedule_interval(self.update, 1/30)
+        elif mode == "unfocused":
+            self.update_event = Clock.schedule_interval(self.update, idle_update_interval)
+
+    def advance_background(self):
+        if self.idle_mode:
+            return  # Nobody is watching the animation
+        self.bg_index = (self.bg_index + 1) % bg_frame_count
+
+    def start_home_chicken_hold(self):
+        self.home_chicken_holding = True
+        self.timers.cancel(self.home_chicken_hold_timer)
+        self.home_chicken_hold_timer = self.timers.schedule(5, self.cook_home_chicken, ("home",))
+
+    def stop_home_chicken_hold(self):
+        self.home_chicken_holding = False
+        self.timers.cancel(self.home_chicken_hold_timer)
+        self.home_chicken_hold_timer = None
+
+    def cook_home_chicken(self):
+        """Held for 5 seconds: show the fried chicken for 3 seconds."""
+        self.home_chicken_hold_timer = None
+        if self.home_chicken_cooked:
+            return
+        self.home_chicken_cooked = True
+        if hit_sound:
+            hit_sound.play()
+        self.home_chicken_cook_timer = self.timers.schedule(3, self.uncook_home_chicken, ("home",))
+
+    def uncook_home_chicken(self):
+        self.home_chicken_cooked = False
+        self.home_chicken_cook_timer = None
+        # Still holding: start cooking again from zero
+        if self.home_chicken_holding:
+            self.start_home_chicken_hold()
+
+    def reset_home_chicken(self):
+        self.stop_home_chicken_hold()
+        self.timers.cancel(self.home_chicken_cook_timer)
+        self.home_chicken_cook_timer = None
+        self.home_chicken_cooked = False
 
     def on_touch_down(self, touch):
         x, y = touch.pos
@@ -328,8 +1445,7 @@ class GameWidget(Widget):
             img = fried_chicken_large
 
             if cx <= x <= cx + img.width and cy <= y <= cy + img.height:
-                self.home_chicken_holding = True
-                self.home_chicken_hold_time = 0
+                self.start_home_chicken_hold()
 
         if self.game_state == "about":
             x0, y0 = self.back_button_pos
@@ -359,9 +1475,7 @@ class GameWidget(Widget):
             if x0 <= x <= x0 + w and y0 <= y <= y0 + h:
                 reset_game(self)
                 self.game_state = "home"
-                self.home_chicken_cooked = False
-                self.home_chicken_hold_time = 0
-                self.home_chicken_cook_timer = 0
+                self.reset_home_chicken()
                 return
             
         # --- Settings menu clicks ---
@@ -408,24 +1522,59 @@ class GameWidget(Widget):
                 button_width = int(WIDTH * 0.15)
                 button_height = int(HEIGHT * 0.08)
                 if x0 <= x <= x0 + button_width and y0 <= y <= y0 + button_height:
-                    self.game_state = "paused"  # Switch to paused state
+                    self.pause_game()  # Switch to paused state
                     return  # Stop processing other touches while pausing
 
-            for chicken in self.chickens:
-                chicken_top = chicken["current_y"] + chicken_height
-                chicken_bottom = chicken["current_y"]
-                if chicken["x"] <= x <= chicken["x"] + chicken_width and chicken_bottom <= y <= chicken_top:
-                    chicken["shot"] = True
-                    chicken["state"] = "hit"
-                    if hit_sound: hit_sound.play()
-                    self.score += 1
-            
+            touch_time = getattr(touch, "time_start", None) or time.time()
+            trace = {"touch": touch_time, "handler": time.time()} if self.profiler.enabled else None
+            if batch_touches:
+                self.touch_queue.append((x, y, touch_time, trace))
+            else:
+                self.resolve_shot(x, y, touch_time, trace)
+
+    def resolve_shot(self, x, y, touch_time, trace=None):
+        """Hit-test a gameplay touch against the chickens that were on screen."""
+        drawn = self.position_history.lookup(touch_time, time.time())
+        hit_any = False
+        for chicken in self.chickens:
+            if chicken["shot"]:
+                continue
+            if drawn is None:
+                cx, cy = chicken["x"], chicken["current_y"]
+            elif id(chicken) in drawn:
+                cx, cy = drawn[id(chicken)]
+            else:
+                continue  # Spawned after the frame the player was looking at
+            if cx <= x <= cx + chicken_width and cy <= y <= cy + chicken_height:
+                chicken["shot"] = True
+                chicken["state"] = "hit"
+                if hit_sound: hit_sound.play()
+                self.score += 1
+                self.particles.emit(chicken["x"] + chicken_width / 2, chicken["current_y"] + chicken_height / 2)
+                if trace is not None and not hit_any:
+                    trace["hit"] = time.time()
+                    chicken["hit_trace"] = trace
+                if self.telemetry:
+                    # Reaction time: seconds since the chicken started jumping, at 30 ticks/s
+                    self.telemetry.record("hit", chicken["jump_progress"] / chicken["jump_speed"] / 30, self)
+                hit_any = True
+        # Misses have no frame to wait for, so record them right away
+        if trace is not None and not hit_any:
+            self.profiler.add_input_trace(trace)
+        if self.telemetry and not hit_any:
+            self.telemetry.record("tap_miss", 0, self)
+
+    def process_touch_queue(self):
+        """Resolve touches queued since the last simulation step."""
+        queued, self.touch_queue = self.touch_queue, []
+        for x, y, touch_time, trace in queued:
+            self.resolve_shot(x, y, touch_time, trace)
+
     def on_touch_up(self, touch):
         self.active_slider = None
         
         if self.game_state == "home":
-            self.home_chicken_holding = False
-            self.home_chicken_hold_time = 0
+            self.stop_home_chicken_hold()
 
     def on_touch_move(self, touch):
         # Only update slider if currently dragging
@@ -433,6 +1582,11 @@ class GameWidget(Widget):
             self.update_slider(touch.x)
 
     def update(self, dt):
+        self.profiler.frame(dt)
+        # Background, home chicken and loading timers for the current screen
+        self.timers.advance(dt, self.game_state)
+        if self.publisher:
+            self.publisher.publish(self.chickens, self.score, self.misses, self.game_state)
 
         if self.game_state == "loading":
                 self.canvas.clear()
@@ -476,31 +1630,12 @@ class GameWidget(Widget):
                 self.music_manager.switch_state("game")
             self.last_game_state = self.game_state
 
-        # --- Update background frame ---
-        self.bg_timer += dt
-        # --- Home chicken hold logic ---
-        if self.game_state == "home":
-
-            if self.home_chicken_holding:
-                self.home_chicken_hold_time += dt
-
-                if self.home_chicken_hold_time >= 5 and not self.home_chicken_cooked:
-                    self.home_chicken_cooked = True
-                    self.home_chicken_cook_timer = 0
-                    if hit_sound:
-                        hit_sound.play()
-
-            if self.home_chicken_cooked:
-                self.home_chicken_cook_timer += dt
-                if self.home_chicken_cook_timer >= 3:
-                    self.home_chicken_cooked = False
-                    self.home_chicken_hold_time = 0
-
-        if self.bg_timer >= 1/10:
-            self.bg_index = (self.bg_index + 1) % bg_frame_count
-            self.bg_timer = 0
-
-        self.spawn_timer += dt
+        # --- Pause menu (frozen gameplay is cached in an Fbo) ---
+        if self.game_state == "paused":
+            self.draw_pause_menu()
+            return
+        if self.pause_fbo is not None:
+            self.release_pause_backdrop()
 
         # --- Clear canvas for redrawing ---
         self.canvas.clear()
@@ -520,8 +1655,7 @@ class GameWidget(Widget):
                 if self.game_state == "home":
                     # Title
                     title_font_size = int(HEIGHT * 0.08)
-                    title = CoreLabel(text="Chicken Shooter Arcade", font_size=title_font_size, color=(1,0,0,1))
-                    title.refresh()
+                    title = cached_label(text="Chicken Shooter Arcade", font_size=title_font_size, color=(1,0,0,1))
                     Rectangle(texture=title.texture,
                             pos=(WIDTH//2 - title.texture.size[0]//2, HEIGHT - 170),
                             size=title.texture.size)
@@ -570,8 +1704,7 @@ class GameWidget(Widget):
                     Color(1,1,1,1)
 
                     # Start Game text
-                    start_label = CoreLabel(text="Start Game", font_size=button_font_size)
-                    start_label.refresh()
+                    start_label = cached_label(text="Start Game", font_size=button_font_size)
                     Rectangle(
                         texture=start_label.texture,
                         pos=(self.start_button_pos[0] + button_width//2 - start_label.texture.size[0]//2,
@@ -580,8 +1713,7 @@ class GameWidget(Widget):
                     )
 
                     # Settings button text
-                    settings_label = CoreLabel(text="Settings", font_size=button_font_size)  # ✅ fixed
-                    settings_label.refresh()
+                    settings_label = cached_label(text="Settings", font_size=button_font_size)  # ✅ fixed
                     Rectangle(
                         texture=settings_label.texture,
                         pos=(self.settings_button_pos[0] + button_width//2 - settings_label.texture.size[0]//2,
@@ -590,8 +1722,7 @@ class GameWidget(Widget):
                     )
 
                     # About text
-                    about_label = CoreLabel(text="About", font_size=button_font_size)
-                    about_label.refresh()
+                    about_label = cached_label(text="About", font_size=button_font_size)
                     Rectangle(
                         texture=about_label.texture,
                         pos=(self.about_button_pos[0] + button_width//2 - about_label.texture.size[0]//2,
@@ -607,8 +1738,7 @@ class GameWidget(Widget):
                     start_y = HEIGHT * 0.65  # lowered a bit more
                     spacing = int(HEIGHT * 0.08)  # space between lines
                     for i, text in enumerate(self.about_texts):
-                        label = CoreLabel(text=text, font_size=int(HEIGHT*0.06), bold=True, color=(0,0,0,1))
-                        label.refresh()
+                        label = cached_label(text=text, font_size=int(HEIGHT*0.06), bold=True, color=(0,0,0,1))
                         text_x = WIDTH//2 - label.texture.size[0]//2
                         text_y = start_y - i * spacing
                         Rectangle(texture=label.texture, pos=(text_x, text_y), size=label.texture.size)
@@ -624,8 +1754,7 @@ class GameWidget(Widget):
 
                     # --- Back button text (normal, centered) ---
                     Color(1,1,1,1)  # white text
-                    back_label = CoreLabel(text="Back", font_size=int(HEIGHT*0.04), bold=False)
-                    back_label.refresh()
+                    back_label = cached_label(text="Back", font_size=int(HEIGHT*0.04))
                     text_x = self.back_button_pos[0] + button_width/2 - back_label.texture.size[0]/2
                     text_y = self.back_button_pos[1] + button_height/2 - back_label.texture.size[1]/2
                     Rectangle(texture=back_label.texture, pos=(text_x, text_y), size=back_label.texture.size)
@@ -638,8 +1767,7 @@ class GameWidget(Widget):
                     Rectangle(texture=fc_img.texture, pos=(fc_x, fc_y), size=(fc_img.width, fc_img.height))
 
                     # Game Over Text above the image
-                    go_label = CoreLabel(text="Game Over!", font_size=int(HEIGHT*0.08), color=(1,0,0,1))
-                    go_label.refresh()
+                    go_label = cached_label(text="Game Over!", font_size=int(HEIGHT*0.08), color=(1,0,0,1))
                     text_x = WIDTH//2 - go_label.texture.size[0]//2
                     text_y = HEIGHT - 170  # Same as home menu title height
                     Rectangle(texture=go_label.texture, pos=(text_x, text_y), size=go_label.texture.size)
@@ -674,8 +1802,7 @@ class GameWidget(Widget):
                     Color(1,1,1,1)
 
                     # Retry text
-                    retry_label = CoreLabel(text="Retry", font_size=button_font_size)
-                    retry_label.refresh()
+                    retry_label = cached_label(text="Retry", font_size=button_font_size)
                     Rectangle(
                         texture=retry_label.texture,
                         pos=(self.retry_button_pos[0] + button_width//2 - retry_label.texture.size[0]//2,
@@ -684,8 +1811,7 @@ class GameWidget(Widget):
                     )
 
                     # Difficulty text
-                    diff_label = CoreLabel(text=self.current_difficulty, font_size=button_font_size)
-                    diff_label.refresh()
+                    diff_label = cached_label(text=self.current_difficulty, font_size=button_font_size)
                     Rectangle(
                         texture=diff_label.texture,
                         pos=(self.diff_button_pos[0] + button_width//2 - diff_label.texture.size[0]//2,
@@ -694,8 +1820,7 @@ class GameWidget(Widget):
                     )
 
                     # Home text
-                    home_label = CoreLabel(text="Home", font_size=button_font_size)
-                    home_label.refresh()
+                    home_label = cached_label(text="Home", font_size=button_font_size)
                     Rectangle(
                         texture=home_label.texture,
                         pos=(self.home_button_pos[0] + button_width//2 - home_label.texture.size[0]//2,
@@ -710,8 +1835,7 @@ class GameWidget(Widget):
                 Rectangle(texture=ground_img.texture, pos=(0, 0), size=(WIDTH, ground_img.height))
                 
                 # --- Title ---
-                title_label = CoreLabel(text="Settings", font_size=int(HEIGHT * 0.08), color=(1,0,0,1))
-                title_label.refresh()
+                title_label = cached_label(text="Settings", font_size=int(HEIGHT * 0.08), color=(1,0,0,1))
                 title_y = HEIGHT - 170
                 Rectangle(texture=title_label.texture,
                         pos=(WIDTH//2 - title_label.texture.size[0]//2, title_y),
@@ -734,18 +1858,8 @@ class GameWidget(Widget):
                 Color(0.8, 0.8, 0.2, 1)
                 Rectangle(pos=(handle_x, handle_y), size=(self.slider_height*2, self.slider_height*2))
 
-                music_label = CoreLabel(
-                    text=f"Music: {int(self.music_volume*100)}%",
-                    font_size=int(HEIGHT*0.03),
-                    color=(0, 0, 0, 1)
-                )
-                music_label.refresh()
-                Rectangle(
-                    texture=music_label.texture,
-                    pos=(WIDTH//2 - music_label.texture.size[0]//2,
-                        self.music_slider_pos[1] + text_offset),
-                    size=music_label.texture.size
-                )
+                self.settings_music_text.draw(self.canvas, f"Music: {int(self.music_volume*100)}%",
+                                              (WIDTH//2, self.music_slider_pos[1] + text_offset), centered=True)
 
                 # --- SFX slider ---
                 Color(0.2, 0.8, 0.2, 1)
@@ -755,18 +1869,8 @@ class GameWidget(Widget):
                 Color(0.8, 0.8, 0.2, 1)
                 Rectangle(pos=(handle_x, handle_y), size=(self.slider_height*2, self.slider_height*2))
 
-                sfx_label = CoreLabel(
-                    text=f"SFX: {int(self.sfx_volume*100)}%",
-                    font_size=int(HEIGHT*0.03),
-                    color=(0, 0, 0, 1)
-                )
-                sfx_label.refresh()
-                Rectangle(
-                    texture=sfx_label.texture,
-                    pos=(WIDTH//2 - sfx_label.texture.size[0]//2,
-                        self.sfx_slider_pos[1] + text_offset),
-                    size=sfx_label.texture.size
-                )
+                self.settings_sfx_text.draw(self.canvas, f"SFX: {int(self.sfx_volume*100)}%",
+                                            (WIDTH//2, self.sfx_slider_pos[1] + text_offset), centered=True)
 
                 # --- Buttons below sliders (even lower now) ---
                 button_width = int(WIDTH * 0.2)
@@ -780,8 +1884,7 @@ class GameWidget(Widget):
                 self.diff_button_size = (button_width, button_height)
                 Color(0.2, 0.6, 0.8, 1)
                 Rectangle(pos=self.diff_button_pos, size=self.diff_button_size)
-                diff_label = CoreLabel(text=self.current_difficulty, font_size=int(HEIGHT*0.04))
-                diff_label.refresh()
+                diff_label = cached_label(text=self.current_difficulty, font_size=int(HEIGHT*0.04))
                 Color(1,1,1,1)
                 Rectangle(texture=diff_label.texture,
                         pos=(self.diff_button_pos[0] + button_width//2 - diff_label.texture.size[0]//2,
@@ -794,8 +1897,7 @@ class GameWidget(Widget):
                 self.back_button_size = (button_width, button_height)
                 Color(0.2, 0.6, 0.8, 1)
                 Rectangle(pos=self.back_button_pos, size=self.back_button_size)
-                back_label = CoreLabel(text="Back", font_size=int(HEIGHT*0.04))
-                back_label.refresh()
+                back_label = cached_label(text="Back", font_size=int(HEIGHT*0.04))
                 Color(1,1,1,1)
                 Rectangle(texture=back_label.texture,
                         pos=(self.back_button_pos[0] + button_width//2 - back_label.texture.size[0]//2,
@@ -804,22 +1906,17 @@ class GameWidget(Widget):
                 
             # --- Gameplay updates ---
             if self.game_state == "playing":
-                # Spawn chickens
-                # Adjust max chickens and spawn interval based on difficulty
-                if self.current_difficulty == "Easy":
-                    max_chickens = min(int((self.max_chickens_base / 3) + self.score // 15), 5)
-                    spawn_interval = max(2.0 - self.score * 0.01, 0.7)
-                elif self.current_difficulty == "Medium":
-                    max_chickens = min(int((self.max_chickens_base / 2) + self.score // 10), 7)
-                    spawn_interval = max(1.5 - self.score * 0.015, 0.5)
-                else:  # Hard
-                    max_chickens = min(int((self.max_chickens_base / 1.5) + self.score // 7), 10)
-                    spawn_interval = max(1.0 - self.score * 0.02, 0.4)
-
-                if self.spawn_timer >= spawn_interval and len(self.chickens) < max_chickens:
-                    self.chickens.append(new_chicken(self.score))
-                    self.spawn_timer = 0
-                    
+                if self.telemetry:
+                    if not self.telemetry.active:
+                        self.telemetry.start()
+                    self.telemetry.frame(dt)
+
+                if self.touch_queue:
+                    self.process_touch_queue()
+
+                # Spawn chickens from the scheduled timeline
+                self.spawn_scheduler.update(dt, self)
+
                 # Update chickens
                 for chicken in self.chickens:
                     if chicken["state"] == "jumping" and not chicken["jump_sound_played"]:
@@ -840,6 +1937,8 @@ class GameWidget(Widget):
                         if chicken["jump_progress"] >= math.pi:
                             if not chicken["shot"]:
                                 self.misses += 1
+                                if self.telemetry:
+                                    self.telemetry.record("miss", 0, self)
                                 if self.misses >= self.max_misses and not self.miss_sound_played:
                                     if failed_sound: failed_sound.play()
                                     self.miss_sound_played = True
@@ -853,13 +1952,29 @@ class GameWidget(Widget):
                     chicken["current_y"] = chicken_y
 
                 # Remove finished chickens
+                for chicken in self.chickens:
+                    # Shot right above the ground: never drawn fried, so the trace ends here
+                    if chicken["state"] == "done" and chicken["hit_trace"] is not None:
+                        self.profiler.add_input_trace(chicken["hit_trace"])
+                        chicken["hit_trace"] = None
                 self.chickens = [c for c in self.chickens if c["state"] != "done"]
 
+                if chicken_collisions:
+                    collide_chickens(self.chickens)
+
+                self.particles.update(dt)
+
                 if len(self.chickens) == 0:
                     self.chickens.append(new_chicken(self.score))
 
+                # Remember what is about to be drawn for lag-compensated hits
+                self.position_history.record(time.time(), self.chickens)
+
                 if self.misses >= self.max_misses:
                     self.game_state = "gameover"
+                    self.delete_snapshot()
+                    if self.telemetry:
+                        self.telemetry.end(self)
 
                 # --- Pause Button ---
                 button_width = int(WIDTH * 0.15)   
@@ -871,8 +1986,7 @@ class GameWidget(Widget):
                 Rectangle(pos=self.pause_button_pos, size=(button_width, button_height))
 
                 # Draw Pause text
-                pause_label = CoreLabel(text="Pause", font_size=int(HEIGHT*0.03))
-                pause_label.refresh()
+                pause_label = cached_label(text="Pause", font_size=int(HEIGHT*0.03))
                 Color(1,1,1,1)  # white text
                 Rectangle(
                     texture=pause_label.texture,
@@ -887,135 +2001,141 @@ class GameWidget(Widget):
                     Rectangle(texture=img.texture,
                             pos=(chicken["x"], chicken["current_y"]),
                             size=(img.width, img.height))
+                    # First frame showing the fried sprite closes the input trace
+                    if chicken["hit_trace"] is not None:
+                        self.profiler.trace_drawn(chicken["hit_trace"])
+                        chicken["hit_trace"] = None
+
+                # --- Hit particles ---
+                if self.particles.active:
+                    Color(1, 0.9, 0.6, 1)
+                    self.canvas.add(self.particles.mesh)
+                    Color(1, 1, 1, 1)
 
                 # --- Draw ground on top ---
                 Rectangle(texture=ground_img.texture, pos=(0, 0), size=(WIDTH, ground_img.height))
 
             # --- Draw scoreboard always on top ---
             if self.game_state == "playing":
-                score_font_size = int(HEIGHT * 0.04)
-                score_label = CoreLabel(
-                    text=f"Score: {self.score}  Misses: {self.misses}",
-                    font_size=score_font_size,
-                    color=(1,0,0,1)
-                )
-                score_label.refresh()
-                Rectangle(
-                    texture=score_label.texture,
-                    pos=(10, HEIGHT - 40),
-                    size=score_label.texture.size
-                )
-
-            # --- Pause menu ---
-            if self.game_state == "paused":
-                # --- Draw gameplay behind pause menu ---
-                for chicken in self.chickens:
-                    img = fried_chicken_small if chicken["state"] == "hit" else chicken_img
-                    Rectangle(texture=img.texture,
-                            pos=(chicken["x"], chicken["current_y"]),
-                            size=(img.width, img.height))
-
-                # Draw ground
-                Rectangle(texture=ground_img.texture, pos=(0, 0), size=(WIDTH, ground_img.height))
-
-                # --- Overlay dimming layer ---
-                Color(0, 0, 0, 0.6)
-                Rectangle(pos=(0, 0), size=(WIDTH, HEIGHT))
-
-                # --- Title ---
-                title_label = CoreLabel(text="Paused", font_size=int(HEIGHT * 0.08), color=(1,0,0,1))
-                title_label.refresh()
-                title_y = HEIGHT - 170
-                Rectangle(texture=title_label.texture,
-                        pos=(WIDTH//2 - title_label.texture.size[0]//2, title_y),
-                        size=title_label.texture.size)
+                self.score_text.draw(self.canvas, f"Score: {self.score}  Misses: {self.misses}", (10, HEIGHT - 40))
 
-                # --- Sliders ---
-                slider_spacing = int(HEIGHT * 0.12)
-                slider_y_top = title_y - int(HEIGHT * 0.15)
+    def render_pause_backdrop(self):
+        """Render the frozen gameplay, dim layer and static pause menu into an Fbo."""
+        fbo = Fbo(size=(WIDTH, HEIGHT))
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            Color(1, 1, 1, 1)
 
-                # Music slider
-                self.music_slider_pos = (WIDTH//2 - self.slider_width//2, slider_y_top)
-                Color(0.2, 0.8, 0.2, 1)
-                Rectangle(pos=self.music_slider_pos, size=(self.slider_width, self.slider_height))
-                handle_x = self.music_slider_pos[0] + self.music_volume * self.slider_width - self.slider_height/2
-                handle_y = self.music_slider_pos[1] - self.slider_height/2
-                Color(0.8, 0.8, 0.2, 1)
-                Rectangle(pos=(handle_x, handle_y), size=(self.slider_height*2, self.slider_height*2))
+            # --- Frozen gameplay ---
+            bg_frame = bg_frames[self.bg_index]
+            scale_ratio = HEIGHT / bg_frame.height
+            new_bg_width = int(bg_frame.width * scale_ratio)
+            bg_x = (WIDTH - new_bg_width) // 2
+            Rectangle(texture=bg_frame.texture, pos=(bg_x, 0), size=(new_bg_width, HEIGHT))
 
-                Color(1,1,1,1)
-                music_label = CoreLabel(text=f"Music: {int(self.music_volume*100)}%", font_size=int(HEIGHT*0.03))
-                music_label.refresh()
-                Rectangle(
-                    texture=music_label.texture,
-                    pos=(WIDTH//2 - music_label.texture.size[0]//2,
-                        self.music_slider_pos[1] + self.slider_height + int(HEIGHT*0.02)),
-                    size=music_label.texture.size
-                )
+            for chicken in self.chickens:
+                img = fried_chicken_small if chicken["state"] == "hit" else chicken_img
+                Rectangle(texture=img.texture,
+                        pos=(chicken["x"], chicken["current_y"]),
+                        size=(img.width, img.height))
+
+            Rectangle(texture=ground_img.texture, pos=(0, 0), size=(WIDTH, ground_img.height))
+
+            # --- Overlay dimming layer ---
+            Color(0, 0, 0, 0.6)
+            Rectangle(pos=(0, 0), size=(WIDTH, HEIGHT))
+
+            # --- Title ---
+            Color(1, 1, 1, 1)
+            title_label = cached_label(text="Paused", font_size=int(HEIGHT * 0.08), color=(1,0,0,1))
+            title_y = HEIGHT - 170
+            Rectangle(texture=title_label.texture,
+                    pos=(WIDTH//2 - title_label.texture.size[0]//2, title_y),
+                    size=title_label.texture.size)
+
+            # --- Slider tracks ---
+            slider_spacing = int(HEIGHT * 0.12)
+            slider_y_top = title_y - int(HEIGHT * 0.15)
+            self.music_slider_pos = (WIDTH//2 - self.slider_width//2, slider_y_top)
+            self.sfx_slider_pos = (WIDTH//2 - self.slider_width//2, slider_y_top - slider_spacing)
+            Color(0.2, 0.8, 0.2, 1)
+            Rectangle(pos=self.music_slider_pos, size=(self.slider_width, self.slider_height))
+            Rectangle(pos=self.sfx_slider_pos, size=(self.slider_width, self.slider_height))
+
+            # --- Buttons below sliders with extra offset ---
+            button_width = int(WIDTH * 0.25)
+            button_height = int(HEIGHT * 0.1)
+            button_spacing = int(HEIGHT * 0.03)
+            extra_offset = int(HEIGHT * 0.05)  # extra space to push buttons lower
+
+            # Resume button
+            self.resume_button_pos = (
+                WIDTH//2 - button_width//2,
+                self.sfx_slider_pos[1] - button_height - button_spacing - extra_offset
+            )
+            self.resume_button_size = (button_width, button_height)
+            Color(0.2, 0.6, 0.8, 1)
+            Rectangle(pos=self.resume_button_pos, size=self.resume_button_size)
+            resume_label = cached_label(text="Resume", font_size=int(HEIGHT*0.05))
+            Color(1,1,1,1)
+            Rectangle(
+                texture=resume_label.texture,
+                pos=(self.resume_button_pos[0]+button_width//2 - resume_label.texture.size[0]//2,
+                    self.resume_button_pos[1]+button_height//2 - resume_label.texture.size[1]//2),
+                size=resume_label.texture.size
+            )
+
+            # Exit button
+            self.exit_button_pos = (
+                WIDTH//2 - button_width//2,
+                self.resume_button_pos[1] - button_height - button_spacing
+            )
+            self.exit_button_size = (button_width, button_height)
+            Color(0.8, 0.2, 0.2, 1)
+            Rectangle(pos=self.exit_button_pos, size=self.exit_button_size)
+            exit_label = cached_label(text="Exit", font_size=int(HEIGHT*0.05))
+            Color(1,1,1,1)
+            Rectangle(
+                texture=exit_label.texture,
+                pos=(self.exit_button_pos[0]+button_width//2 - exit_label.texture.size[0]//2,
+                    self.exit_button_pos[1]+button_height//2 - exit_label.texture.size[1]//2),
+                size=exit_label.texture.size
+            )
+        fbo.draw()
+        return fbo
+
+    def release_pause_backdrop(self):
+        self.pause_fbo.clear()
+        self.pause_fbo = None
+        self.pause_drawn_volumes = None
+
+    def draw_pause_menu(self):
+        """Draw the cached pause backdrop; only slider handles and labels are redrawn."""
+        if self.pause_fbo is None:
+            self.pause_fbo = self.render_pause_backdrop()
+        volumes = (self.music_volume, self.sfx_volume)
+        if volumes == self.pause_drawn_volumes:
+            return  # Nothing changed since the last frame
+        self.pause_drawn_volumes = volumes
 
-                # SFX slider (below Music)
-                self.sfx_slider_pos = (WIDTH//2 - self.slider_width//2, slider_y_top - slider_spacing)
-                Color(0.2, 0.8, 0.2, 1)
-                Rectangle(pos=self.sfx_slider_pos, size=(self.slider_width, self.slider_height))
-                handle_x = self.sfx_slider_pos[0] + self.sfx_volume * self.slider_width - self.slider_height/2
-                handle_y = self.sfx_slider_pos[1] - self.slider_height/2
+        self.canvas.clear()
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            Rectangle(texture=self.pause_fbo.texture, pos=(0, 0), size=(WIDTH, HEIGHT))
+
+            for slider_pos, volume, name, hud_text in [
+                    (self.music_slider_pos, self.music_volume, "Music", self.pause_music_text),
+                    (self.sfx_slider_pos, self.sfx_volume, "SFX", self.pause_sfx_text)]:
+                handle_x = slider_pos[0] + volume * self.slider_width - self.slider_height/2
+                handle_y = slider_pos[1] - self.slider_height/2
                 Color(0.8, 0.8, 0.2, 1)
                 Rectangle(pos=(handle_x, handle_y), size=(self.slider_height*2, self.slider_height*2))
 
                 Color(1,1,1,1)
-                sfx_label = CoreLabel(text=f"SFX: {int(self.sfx_volume*100)}%", font_size=int(HEIGHT*0.03))
-                sfx_label.refresh()
-                Rectangle(
-                    texture=sfx_label.texture,
-                    pos=(WIDTH//2 - sfx_label.texture.size[0]//2,
-                        self.sfx_slider_pos[1] + self.slider_height + int(HEIGHT*0.02)),
-                    size=sfx_label.texture.size
-                )
-
-                # --- Buttons below sliders with extra offset ---
-                button_width = int(WIDTH * 0.25)
-                button_height = int(HEIGHT * 0.1)
-                button_spacing = int(HEIGHT * 0.03)
-                extra_offset = int(HEIGHT * 0.05)  # extra space to push buttons lower
-
-                # Resume button
-                self.resume_button_pos = (
-                    WIDTH//2 - button_width//2,
-                    self.sfx_slider_pos[1] - button_height - button_spacing - extra_offset
-                )
-                self.resume_button_size = (button_width, button_height)
-                Color(0.2, 0.6, 0.8, 1)
-                Rectangle(pos=self.resume_button_pos, size=self.resume_button_size)
-                resume_label = CoreLabel(text="Resume", font_size=int(HEIGHT*0.05))
-                resume_label.refresh()
-                Color(1,1,1,1)
-                Rectangle(
-                    texture=resume_label.texture,
-                    pos=(self.resume_button_pos[0]+button_width//2 - resume_label.texture.size[0]//2,
-                        self.resume_button_pos[1]+button_height//2 - resume_label.texture.size[1]//2),
-                    size=resume_label.texture.size
-                )
-
-                # Exit button
-                self.exit_button_pos = (
-                    WIDTH//2 - button_width//2,
-                    self.resume_button_pos[1] - button_height - button_spacing
-                )
-                self.exit_button_size = (button_width, button_height)
-                Color(0.8, 0.2, 0.2, 1)
-                Rectangle(pos=self.exit_button_pos, size=self.exit_button_size)
-                exit_label = CoreLabel(text="Exit", font_size=int(HEIGHT*0.05))
-                exit_label.refresh()
-                Color(1,1,1,1)
-                Rectangle(
-                    texture=exit_label.texture,
-                    pos=(self.exit_button_pos[0]+button_width//2 - exit_label.texture.size[0]//2,
-                        self.exit_button_pos[1]+button_height//2 - exit_label.texture.size[1]//2),
-                    size=exit_label.texture.size
-                )
+                hud_text.draw(self.canvas, f"{name}: {int(volume*100)}%",
+                              (WIDTH//2, slider_pos[1] + self.slider_height + int(HEIGHT*0.02)), centered=True)
 
-                return
-            
     def update_slider(self, x):
         """Update SFX or Music volume based on slider position."""
         if self.active_slider == "sfx":
@@ -1025,9 +2145,63 @@ class GameWidget(Widget):
             self.music_volume = max(0.0, min((x - self.music_slider_pos[0]) / self.slider_width, 1.0))
             self.music_manager.set_volume(self.music_volume)
                 
+# --- Spectator display ---
+class SpectatorWidget(Widget):
+    """Draws a game streamed by StatePublisher without running the simulation."""
+    def __init__(self, address, **kwargs):
+        super().__init__(**kwargs)
+        self.receiver = StateReceiver(address, (WIDTH, HEIGHT))
+        self.score_text = HudText(int(HEIGHT * 0.04), color=(1,0,0,1))
+        self.bg_index = 0
+        self.timers = TimerWheel()
+        self.timers.schedule(1/10, self.advance_background, repeat=True)
+        Clock.schedule_interval(self.update, 1/30)
+
+    def advance_background(self):
+        self.bg_index = (self.bg_index + 1) % bg_frame_count
+
+    def update(self, dt):
+        self.timers.advance(dt)
+        self.receiver.poll()
+        receiver = self.receiver
+        # Positions arrive in the sender's screen coordinates
+        scale_x = WIDTH / receiver.sender_size[0]
+        scale_y = HEIGHT / receiver.sender_size[1]
+
+        self.canvas.clear()
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            bg_frame = bg_frames[self.bg_index]
+            new_bg_width = int(bg_frame.width * HEIGHT / bg_frame.height)
+            Rectangle(texture=bg_frame.texture, pos=((WIDTH - new_bg_width) // 2, 0), size=(new_bg_width, HEIGHT))
+
+            for x, y, fried in receiver.chickens.values():
+                img = fried_chicken_small if fried else chicken_img
+                Rectangle(texture=img.texture, pos=(x * scale_x, y * scale_y), size=(img.width, img.height))
+
+            Rectangle(texture=ground_img.texture, pos=(0, 0), size=(WIDTH, ground_img.height))
+
+            if receiver.game_state in ["playing", "paused", "gameover"]:
+                self.score_text.draw(self.canvas, f"Score: {receiver.score}  Misses: {receiver.misses}",
+                                     (10, HEIGHT - 40))
+
+            messages = {None: "Waiting for game...", "paused": "Paused", "gameover": "Game Over!"}
+            message = messages.get(receiver.game_state, "" if receiver.game_state == "playing" else "Next game starting soon")
+            if message:
+                label = cached_label(text=message, font_size=int(HEIGHT * 0.08), color=(1,0,0,1))
+                Rectangle(texture=label.texture,
+                        pos=(WIDTH//2 - label.texture.size[0]//2, HEIGHT//2),
+                        size=label.texture.size)
+
 class ChickenShooterApp(App):
     def build(self):
-        return GameWidget()
+        if viewer_address:
+            return SpectatorWidget(parse_address(viewer_address, default_host="0.0.0.0"))
+        return GameWidget(snapshot_path=os.path.join(self.user_data_dir, "snapshot.bin"))
+
+    def on_stop(self):
+        if isinstance(self.root, GameWidget):
+            self.root.shutdown()
 
 if __name__ == "__main__":
     set_sfx_volume(sfx_volume)  # keep SFX function as-is
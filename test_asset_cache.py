@@ -0,0 +1,80 @@
+import ctypes
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import asset_cache
+
+size = (4, 2)
+frame = bytes(range(size[0] * size[1] * 4))
+
+def assert_uploadable(buffer):
+    """Kivy's blit_buffer takes bytes as-is and needs anything else to be a writable buffer."""
+    if isinstance(buffer, bytes):
+        return
+    (ctypes.c_char * len(buffer)).from_buffer(buffer)  # raises TypeError if read-only
+
+class AssetCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.asset = os.path.join(self.tmp.name, "asset.png")
+        with open(self.asset, "wb") as f:
+            f.write(b"not really a png")
+        self.cache_dir = asset_cache.asset_cache_dir
+        asset_cache.asset_cache_dir = os.path.join(self.tmp.name, "cache")
+        self.decodes = 0
+
+    def tearDown(self):
+        asset_cache.asset_cache_dir = self.cache_dir
+        self.tmp.cleanup()
+
+    def decode(self):
+        self.decodes += 1
+        return [frame, frame[::-1]]
+
+    def load(self):
+        return asset_cache.load_cached_frames(self.asset, size, self.decode)
+
+    def test_mapped_frames_are_uploadable(self):
+        self.load()
+        frames = self.load()
+        self.assertEqual(self.decodes, 1)
+        self.assertEqual([bytes(f) for f in frames], [frame, frame[::-1]])
+        for f in frames:
+            assert_uploadable(f)
+
+    def test_writes_stay_private(self):
+        self.load()
+        frames = self.load()
+        frames[0][0] = 255
+        self.assertEqual(bytes(self.load()[0]), frame)
+
+    def test_unwritable_cache_falls_back_to_bytes(self):
+        # A file where the cache directory should be makes every write fail
+        with open(asset_cache.asset_cache_dir, "wb"):
+            pass
+        frames = self.load()
+        self.assertEqual(frames, [frame, frame[::-1]])
+        for f in frames:
+            assert_uploadable(f)
+
+    def test_read_only_cache_is_still_mapped(self):
+        self.load()
+        # A shared, pre-filled cache the player may not touch
+        with mock.patch("asset_cache.os.utime", side_effect=PermissionError):
+            frames = self.load()
+        self.assertEqual(self.decodes, 1)
+        self.assertNotIsInstance(frames[0], bytes)
+
+    @unittest.skipUnless(importlib.util.find_spec("kivy"), "Kivy is not installed")
+    def test_upload_cached_frame(self):
+        from kivy.core.window import Window  # noqa: F401, creates the GL context
+        from kivy.graphics.texture import Texture
+        self.load()
+        texture = Texture.create(size=size, colorfmt="rgba")
+        texture.blit_buffer(self.load()[0], colorfmt="rgba", bufferfmt="ubyte")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import select
+import unittest
+
+from broadcast import (StatePublisher, StateReceiver, broadcast_delta, broadcast_header,
+                       broadcast_keyframe, keyframe_interval, offset_step)
+
+def make_chicken(x, y, state="jumping"):
+    return {"x": x, "current_y": y, "state": state}
+
+class BroadcastRoundTripTest(unittest.TestCase):
+    """Streams packets over localhost UDP and checks what the viewer rebuilds."""
+    def setUp(self):
+        self.receiver = StateReceiver(("127.0.0.1", 0), (1, 1))
+        self.publisher = StatePublisher(self.receiver.sock.getsockname(), (800, 600))
+        self.chickens = [make_chicken(100, 0), make_chicken(300, 50), make_chicken(500, 120)]
+
+    def tearDown(self):
+        self.receiver.sock.close()
+        self.publisher.sock.close()
+
+    def send(self, score=0):
+        """Publish one tick and let the receiver process it; returns the packet kind."""
+        packet = self.publisher.encode(self.chickens, score, 0, "playing")
+        self.deliver(packet)
+        return broadcast_header.unpack_from(packet)[1]
+
+    def deliver(self, packet):
+        self.publisher.sock.sendto(packet, self.publisher.address)
+        select.select([self.receiver.sock], [], [], 1.0)
+        self.receiver.poll()
+
+    def drop(self):
+        """Encode one tick without delivering it, as if the packet was lost."""
+        self.publisher.encode(self.chickens, 0, 0, "playing")
+
+    def assertViewerMatches(self, tolerance=0):
+        expected = sorted((int(c["x"]), int(c["current_y"]), c["state"] == "hit")
+                          for c in self.chickens if c["state"] != "done")
+        shown = sorted(self.receiver.chickens.values())
+        self.assertEqual(len(shown), len(expected))
+        for (x, y, fried), (ex, ey, efried) in zip(shown, expected):
+            self.assertLessEqual(abs(x - ex), tolerance)
+            self.assertLessEqual(abs(y - ey), tolerance)
+            self.assertEqual(fried, efried)
+
+    def move(self, dx, dy):
+        for chicken in self.chickens:
+            chicken["x"] += dx
+            chicken["current_y"] += dy
+
+    def test_keyframe(self):
+        self.assertEqual(self.send(score=7), broadcast_keyframe)
+        self.assertViewerMatches()
+        self.assertEqual(self.receiver.score, 7)
+        self.assertEqual(self.receiver.game_state, "playing")
+        self.assertEqual(self.receiver.sender_size, (800, 600))
+
+    def test_delta_uses_offsets(self):
+        self.send()
+        self.move(3, 17)
+        self.chickens[1]["state"] = "hit"
+        self.chickens[2]["state"] = "done"
+        packet = self.publisher.encode(self.chickens, 0, 0, "playing")
+        self.assertEqual(broadcast_header.unpack_from(packet)[1], broadcast_delta)
+        # Two offset records and one removed id beat three absolute records
+        self.assertLess(len(packet), broadcast_header.size + 3 * 7)
+        self.deliver(packet)
+        self.assertViewerMatches(tolerance=offset_step // 2)
+
+    def test_far_moves_fall_back_to_absolute_records(self):
+        self.send()
+        self.chickens[0]["current_y"] += 400
+        self.move(1, 1)
+        self.assertEqual(self.send(), broadcast_delta)
+        self.assertViewerMatches(tolerance=offset_step // 2)
+
+    def test_new_chicken_in_delta(self):
+        self.send()
+        self.chickens.append(make_chicken(640, 10))
+        self.assertEqual(self.send(), broadcast_delta)
+        self.assertViewerMatches()
+
+    def test_dropped_delta(self):
+        self.send()
+        self.move(5, 20)
+        self.drop()
+        self.move(5, 20)
+        self.assertEqual(self.send(), broadcast_delta)
+        self.assertViewerMatches(tolerance=offset_step // 2)
+
+    def test_dropped_keyframe(self):
+        self.send()
+        for _ in range(keyframe_interval - 1):
+            self.move(0, 1)
+            self.send()
+        self.move(0, 1)
+        self.drop()  # the next keyframe is lost
+        stale = dict(self.receiver.chickens)
+        self.move(0, 1)
+        self.assertEqual(self.send(), broadcast_delta)
+        # Deltas against the missing keyframe are ignored until a new one arrives
+        self.assertEqual(self.receiver.chickens, stale)
+        for _ in range(keyframe_interval):
+            self.move(0, 1)
+            self.send()
+        self.assertViewerMatches(tolerance=offset_step // 2)
+
+    def test_malformed_packet_is_ignored(self):
+        self.send()
+        shown = dict(self.receiver.chickens)
+        self.deliver(b"CSB2garbage")
+        self.assertEqual(self.receiver.chickens, shown)
+
+    def forged_packet(self, **fields):
+        """A valid next packet with some header fields overwritten."""
+        packet = self.publisher.encode(self.chickens, 99, 0, "playing")
+        names = ("magic", "kind", "tick", "keyframe_tick", "width", "height", "score", "misses",
+                 "state", "absolute_count", "offset_count", "removed_count")
+        values = dict(zip(names, broadcast_header.unpack_from(packet)))
+        values.update(fields)
+        return broadcast_header.pack(*values.values()) + packet[broadcast_header.size:]
+
+    def assertViewerUnchanged(self, packet):
+        seen = (self.receiver.tick, self.receiver.sender_size, self.receiver.score, dict(self.receiver.chickens))
+        self.deliver(packet)
+        self.assertEqual((self.receiver.tick, self.receiver.sender_size, self.receiver.score,
+                          self.receiver.chickens), seen)
+
+    def test_zero_sender_size_is_ignored(self):
+        self.send()
+        self.assertViewerUnchanged(self.forged_packet(width=0))
+        self.assertViewerUnchanged(self.forged_packet(height=0))
+        self.assertEqual(self.receiver.sender_size, (800, 600))
+
+    def test_unknown_game_state_is_ignored(self):
+        self.send()
+        self.move(0, 8)
+        self.assertViewerUnchanged(self.forged_packet(state=200))
+        self.assertEqual(self.receiver.game_state, "playing")
+
+if __name__ == "__main__":
+    unittest.main()